@@ -4,6 +4,7 @@ PyInstaller build script for Macallan RF Performance Tool
 
 import os
 import sys
+import shutil
 import subprocess
 from pathlib import Path
 
@@ -16,28 +17,36 @@ def build_executable():
     # PyInstaller command
     cmd = [
         "pyinstaller",
-        "--onefile",  # Create a single executable file
+        "--onedir",  # Unpacked bundle - avoids extracting an archive to a temp dir on every launch
+        "--contents-directory=_internal",  # Keep support files out of the top-level folder
         "--windowed",  # Don't show console window
         "--name=Macallan_RF_Tool",
         "--add-data=config;config",  # Include config directory
         "--add-data=src;src",  # Include src directory
-        "--hidden-import=PyQt6",
-        "--hidden-import=matplotlib",
-        "--hidden-import=numpy",
-        "--hidden-import=pandas",
-        "--hidden-import=scipy",
-        "--hidden-import=reportlab",
-        "--hidden-import=skrf",
-        "--collect-all=matplotlib",
-        "--collect-all=numpy",
-        "--collect-all=pandas",
-        "--collect-all=scipy",
-        "--collect-all=PyQt6",
-        "--collect-all=reportlab",
-        "--collect-all=skrf",
+        # Let PyInstaller's import analysis pick up packages; only list what it cannot see
+        "--hidden-import=openpyxl",  # Loaded dynamically by pandas.read_excel
+        "--collect-data=matplotlib",  # Fonts, style sheets and matplotlibrc
+        "--collect-data=reportlab",  # Font metrics used for PDF reports
+        "--collect-data=skrf",  # Calibration kit / media data files
+        # Standard-library / dev packages the application never uses
+        "--exclude-module=tkinter",
+        "--exclude-module=test",
+        "--exclude-module=pydoc",
+        "--exclude-module=IPython",
         "src/main.py"
     ]
     
+    # Compress bundled binaries with UPX when it is available
+    upx_dir = os.environ.get("UPX_DIR")
+    if upx_dir:
+        cmd.insert(-1, f"--upx-dir={upx_dir}")
+    elif not shutil.which("upx"):
+        print("UPX not found (set UPX_DIR or add upx to PATH) - binaries will not be compressed")
+    
+    # Strip symbol tables from binaries (not supported by the Windows toolchain)
+    if sys.platform != "win32":
+        cmd.insert(-1, "--strip")
+    
     # Add version info
     version_info = f"""
 # UTF-8
@@ -89,7 +98,7 @@ VSVersionInfo(
         # Run PyInstaller
         result = subprocess.run(cmd, cwd=project_root, check=True, capture_output=True, text=True)
         print("Build successful!")
-        print(f"Executable created in: {project_root / 'dist' / 'Macallan_RF_Tool.exe'}")
+        print(f"Executable created in: {project_root / 'dist' / 'Macallan_RF_Tool' / 'Macallan_RF_Tool.exe'}")
         
     except subprocess.CalledProcessError as e:
         print(f"Build failed with error: {e}")
@@ -109,9 +118,16 @@ VSVersionInfo(
     return True
 
 def create_installer():
-    """Create an installer using NSIS (optional)."""
+    """Create a distributable zip of the build folder, or an installer using NSIS (optional)."""
+    project_root = Path(__file__).parent
+    bundle_dir = project_root / 'dist' / 'Macallan_RF_Tool'
+    
+    # The one-folder build is shipped as a single zip archive
+    archive = shutil.make_archive(str(bundle_dir), 'zip', str(bundle_dir))
+    print(f"\nDistributable archive created: {archive}")
+    
     print("\nTo create an installer, you can use NSIS or Inno Setup.")
-    print("The executable is located in the 'dist' directory.")
+    print("The executable is located in the 'dist/Macallan_RF_Tool' directory.")
 
 if __name__ == "__main__":
     print("Macallan RF Performance Tool - Build Script")
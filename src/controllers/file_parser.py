@@ -4,102 +4,113 @@ File parsing and metadata extraction
 
 import re
 import os
+import functools
 from typing import List, Dict, Optional, Tuple
 from src.models.test_data import FileMetadata
 
+# Regex patterns for filename parsing, compiled once at import - one per metadata field, named after
+# the FileMetadata attribute it fills and searched independently (the first match of each wins)
+_FIELD_PATTERNS = {
+    'date_code': re.compile(r'(\d{8})'),  # YYYYMMDD
+    'serial_number': re.compile(r'(SN\d+)', re.IGNORECASE),
+    'part_number': re.compile(r'(L\d{4,6})', re.IGNORECASE),  # Allow 4-6 digits
+    'pri_red': re.compile(r'_(PRI|RED)(?:_|\.)', re.IGNORECASE),  # Allow _PRI_ or _PRI.
+    'hg_lg': re.compile(r'_(HG|LG)(?:_|\.)', re.IGNORECASE)  # Allow _HG_ or _HG.
+}
+
+# Anchored pattern for the documented naming convention
+# (YYYYMMDD_LXXXXXX_PRI/RED_SNXXXX_HG/LG.ext), matched in a single fullmatch. The extension
+# can't contain '_' or '.', so every field matches where the independent searches would find it
+_STANDARD_FILENAME_RE = re.compile(
+    r'(?P<date_code>\d{8})_(?P<part_number>L\d{4,6})_(?P<pri_red>PRI|RED)'
+    r'_(?P<serial_number>SN\d+)(?:_(?P<hg_lg>HG|LG))?\.[A-Za-z0-9]+',
+    re.IGNORECASE)
+
+@functools.lru_cache(maxsize=512)
+def _parse_basename(basename: str) -> Optional[FileMetadata]:
+    """Parse a basename to extract metadata (cached, the same file is parsed repeatedly)."""
+    # Cheap substring pre-filter - reject unrelated files without running the regex
+    upper = basename.upper()
+    if 'SN' not in upper or 'L' not in upper or not ('_PRI' in upper or '_RED' in upper):
+        return None
+
+    # Fast path: filenames following the standard convention
+    match = _STANDARD_FILENAME_RE.fullmatch(basename)
+    if match:
+        hg_lg = match.group('hg_lg')
+        return FileMetadata(
+            date_code=match.group('date_code'),
+            serial_number=match.group('serial_number').upper(),
+            part_number=match.group('part_number').upper(),
+            pri_red=match.group('pri_red').upper(),
+            hg_lg=hg_lg.upper() if hg_lg else None
+        )
+    
+    # Fields in any other order: search for each field on its own
+    fields = {}
+    for field_name, pattern in _FIELD_PATTERNS.items():
+        match = pattern.search(basename)
+        if match:
+            fields[field_name] = match.group(1).upper()
+        elif field_name != 'hg_lg':
+            return None  # Date, serial number, part number and PRI/RED are required; HG/LG is optional
+    
+    return FileMetadata(**fields)
+
 class FileParser:
     """Parser for extracting metadata from filenames and loading data files."""
     
     def __init__(self):
-        # Regex patterns for filename parsing
-        self.date_pattern = re.compile(r'(\d{8})')  # YYYYMMDD
-        self.serial_pattern = re.compile(r'(SN\d+)', re.IGNORECASE)
-        self.part_pattern = re.compile(r'(L\d{4,6})', re.IGNORECASE)  # Allow 4-6 digits
-        self.pri_red_pattern = re.compile(r'_(PRI|RED)(?:_|\.)', re.IGNORECASE)  # Allow _PRI_ or _PRI.
-        self.hg_lg_pattern = re.compile(r'_(HG|LG)(?:_|\.)', re.IGNORECASE)  # Allow _HG_ or _HG.
+        pass
     
     def parse_filename(self, filename: str) -> Optional[FileMetadata]:
         """Parse filename to extract metadata."""
-        basename = os.path.basename(filename)
-        
-        # Extract date (YYYYMMDD)
-        date_match = self.date_pattern.search(basename)
-        if not date_match:
-            return None
-        date_code = date_match.group(1)
-        
-        # Extract serial number (SNXXXX)
-        serial_match = self.serial_pattern.search(basename)
-        if not serial_match:
-            return None
-        serial_number = serial_match.group(1).upper()
-        
-        # Extract part number (LXXXXXX)
-        part_match = self.part_pattern.search(basename)
-        if not part_match:
-            return None
-        part_number = part_match.group(1).upper()
-        
-        # Extract PRI/RED
-        pri_red_match = self.pri_red_pattern.search(basename)
-        if not pri_red_match:
-            return None
-        pri_red = pri_red_match.group(1).upper()
-        
-        # Extract HG/LG (optional)
-        hg_lg_match = self.hg_lg_pattern.search(basename)
-        hg_lg = hg_lg_match.group(1).upper() if hg_lg_match else None
-        
-        return FileMetadata(
-            date_code=date_code,
-            serial_number=serial_number,
-            part_number=part_number,
-            pri_red=pri_red,
-            hg_lg=hg_lg
-        )
+        return _parse_basename(os.path.basename(filename))
     
-    def validate_file_set(self, files: List[str], hg_lg_enabled: bool) -> Tuple[bool, str, List[FileMetadata]]:
-        """Validate that the file set is complete and correctly parsed."""
+    def validate_file_set(self, files: List[str], hg_lg_enabled: bool
+                          ) -> Tuple[bool, str, List[FileMetadata], Dict[FileMetadata, str]]:
+        """Validate that the file set is complete and correctly parsed, also returning a metadata -> file path index."""
         if not files:
-            return False, "No files selected", []
+            return False, "No files selected", [], {}
         
         # Parse all files
         metadata_list = []
+        file_by_metadata = {}
         for file_path in files:
             metadata = self.parse_filename(file_path)
             if not metadata:
-                return False, f"Could not parse filename: {os.path.basename(file_path)}", []
+                return False, f"Could not parse filename: {os.path.basename(file_path)}", [], {}
             metadata_list.append(metadata)
+            file_by_metadata.setdefault(metadata, file_path)
         
         # Check for required files
         if hg_lg_enabled:
             # Need 4 files: PRI HG, PRI LG, RED HG, RED LG
             if len(metadata_list) != 4:
-                return False, "HG/LG enabled DUT requires exactly 4 files", metadata_list
+                return False, "HG/LG enabled DUT requires exactly 4 files", metadata_list, file_by_metadata
             
             # Check for all required combinations
             required_combinations = [
                 ("PRI", "HG"), ("PRI", "LG"), ("RED", "HG"), ("RED", "LG")
             ]
             
-            found_combinations = []
-            for metadata in metadata_list:
-                found_combinations.append((metadata.pri_red, metadata.hg_lg))
+            found_combinations = {(m.pri_red, m.hg_lg) for m in metadata_list}
             
+            # Report the first missing combination in the order listed above
             for required in required_combinations:
                 if required not in found_combinations:
-                    return False, f"Missing file for {required[0]} {required[1]}", metadata_list
+                    return False, f"Missing file for {required[0]} {required[1]}", metadata_list, file_by_metadata
         else:
             # Need 2 files: PRI, RED
             if len(metadata_list) != 2:
-                return False, "DUT requires exactly 2 files (PRI and RED)", metadata_list
+                return False, "DUT requires exactly 2 files (PRI and RED)", metadata_list, file_by_metadata
             
             # Check for PRI and RED
-            pri_red_values = [m.pri_red for m in metadata_list]
-            if "PRI" not in pri_red_values or "RED" not in pri_red_values:
-                return False, "Missing PRI or RED file", metadata_list
+            pri_red_values = {m.pri_red for m in metadata_list}
+            if not {"PRI", "RED"} <= pri_red_values:
+                return False, "Missing PRI or RED file", metadata_list, file_by_metadata
         
-        return True, "File set is valid", metadata_list
+        return True, "File set is valid", metadata_list, file_by_metadata
     
     def group_files_by_type(self, metadata_list: List[FileMetadata]) -> Dict[str, FileMetadata]:
         """Group files by their type (PRI, RED, etc.)."""
@@ -117,13 +128,11 @@ class FileParser:
     
     def get_file_for_metadata(self, files: List[str], target_metadata: FileMetadata) -> Optional[str]:
         """Get the file path for a specific metadata."""
+        # FileMetadata is hashable, so match all five fields with one dict lookup
+        # (setdefault keeps the first file when several parse to the same metadata)
+        file_by_metadata = {}
         for file_path in files:
             metadata = self.parse_filename(file_path)
-            if (metadata and 
-                metadata.date_code == target_metadata.date_code and
-                metadata.serial_number == target_metadata.serial_number and
-                metadata.part_number == target_metadata.part_number and
-                metadata.pri_red == target_metadata.pri_red and
-                metadata.hg_lg == target_metadata.hg_lg):
-                return file_path
-        return None
+            if metadata:
+                file_by_metadata.setdefault(metadata, file_path)
+        return file_by_metadata.get(target_metadata)
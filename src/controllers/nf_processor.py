@@ -3,70 +3,67 @@ Noise figure processing and calculations
 """
 
 import numpy as np
+from collections import namedtuple
 from typing import List, Dict, Tuple, Optional
 from src.models.test_data import NoiseFigureData
 from src.models.dut_config import DUTConfiguration, TestStageRequirements
-from src.constants import TEST_STAGES
+
+# Worst-case (maximum) noise figure point
+WorstCaseNF = namedtuple("WorstCaseNF", "nf_max frequency_at_max index_at_max")
+
+# Fixed labels for the noise figure plot
+_PLOT_LABELS = {
+    'title': "Noise Figure vs Frequency",
+    'x_label': "Frequency (GHz)",
+    'y_label': "Noise Figure (dB)"
+}
 
 class NoiseFigureProcessor:
     """Processor for noise figure calculations and analysis."""
     
     def __init__(self):
-        pass
+        # (nf_data, worst case) of the last processed data - the data is kept so its id can't be reused
+        self._worst_case = None
     
-    def find_worst_case_nf(self, frequencies: List[float], nf_values: List[float]) -> Dict[str, float]:
-        """Find worst-case (maximum) noise figure."""
-        if not frequencies or not nf_values:
-            return {'nf_max': 0.0, 'frequency_at_max': 0.0, 'index_at_max': 0}
+    def find_worst_case_nf(self, data: np.ndarray) -> WorstCaseNF:
+        """Find worst-case (maximum) noise figure in a 2 x N frequency/NF block."""
+        data = np.asarray(data, dtype=np.float64).reshape(2, -1)
+        if data.shape[1] == 0:
+            return WorstCaseNF(0.0, 0.0, 0)
         
-        # Find index of maximum NF
-        max_idx = np.argmax(nf_values)
+        # Find index of maximum NF; its frequency is in the same column
+        max_idx = int(data[1].argmax())
         
-        return {
-            'nf_max': nf_values[max_idx],
-            'frequency_at_max': frequencies[max_idx],
-            'index_at_max': max_idx
-        }
+        return WorstCaseNF(float(data[1, max_idx]), float(data[0, max_idx]), max_idx)
     
     def process_noise_figure(self, nf_data: NoiseFigureData,
                            dut_config: DUTConfiguration,
                            test_stage: str) -> Dict[str, any]:
         """Process noise figure data and calculate requirements."""
         # Get requirements for the test stage
-        if test_stage == TEST_STAGES["board_bringup"]:
-            requirements = dut_config.board_bringup
-        elif test_stage == TEST_STAGES["sit"]:
-            requirements = dut_config.sit
-        elif test_stage == TEST_STAGES["test_campaign"]:
-            requirements = dut_config.test_campaign
-        else:
+        requirements = dut_config.get_requirements(test_stage)
+        if requirements is None:
             raise ValueError(f"Unknown test stage: {test_stage}")
         
-        # Find worst-case NF
-        worst_case = self.find_worst_case_nf(nf_data.frequency, nf_data.nf)
+        # Find worst-case NF (memoized per data object, it does not depend on the test stage)
+        if self._worst_case is None or self._worst_case[0] is not nf_data:
+            self._worst_case = (nf_data, self.find_worst_case_nf(nf_data.data))
+        nf_max, frequency_at_max, _ = self._worst_case[1]
         
         # Check requirement
-        nf_pass = worst_case['nf_max'] <= requirements.nf_max_db
+        nf_pass = nf_max <= requirements.nf_max_db
         
         return {
             'frequency': nf_data.frequency,
             'nf': nf_data.nf,
-            'nf_max': worst_case['nf_max'],
-            'frequency_at_max': worst_case['frequency_at_max'],
+            'nf_max': nf_max,
+            'frequency_at_max': frequency_at_max,
             'requirement': requirements.nf_max_db,
             'pass': nf_pass,
-            'margin': requirements.nf_max_db - worst_case['nf_max']
+            'margin': requirements.nf_max_db - nf_max
         }
     
     def get_plot_data(self, results: Dict[str, any]) -> Dict[str, any]:
         """Get data for plotting."""
-        return {
-            'frequency': results['frequency'],
-            'nf': results['nf'],
-            'nf_max': results['nf_max'],
-            'frequency_at_max': results['frequency_at_max'],
-            'requirement': results['requirement'],
-            'title': "Noise Figure vs Frequency",
-            'x_label': "Frequency (GHz)",
-            'y_label': "Noise Figure (dB)"
-        }
+        # Results already carry the plot data; the frequency/nf arrays are shared, not copied
+        return {**results, **_PLOT_LABELS}
@@ -3,448 +3,463 @@ Power and linearity processing and calculations
 """
 
 import numpy as np
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Optional
 from src.models.test_data import PowerLinearityData
 from src.models.dut_config import DUTConfiguration, TestStageRequirements, PinPoutIM3Requirement
-from src.constants import TEST_STAGES, P1DB_THRESHOLD_DB
+from src.constants import P1DB_THRESHOLD_DB
+
+# Number of processed (power data, requirements) pairs kept by PowerProcessor
+_RESULTS_CACHE_SIZE = 8
+
+# Plot colors for different frequencies and line styles for different file types
+_PLOT_COLORS = ('blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray')
+_LINE_STYLES = {'PRI': '-', 'RED': '--'}
 
 class PowerProcessor:
     """Processor for power and linearity calculations and analysis."""
     
     def __init__(self):
-        pass
+        # (id(power_data), id(requirements)) -> (power_data, requirements, results), least recently used first
+        self._results_cache = OrderedDict()
+        # id(power_data) -> (power_data, Pin-sorted arrays per frequency), least recently used first
+        self._sorted_cache = OrderedDict()
     
-    def find_p1db(self, pin: List[float], pout: List[float]) -> float:
+    def find_p1db(self, pin: np.ndarray, pout: np.ndarray) -> float:
         """Find P1dB compression point."""
-        if len(pin) < 2 or len(pout) < 2:
+        # No-op for the float64 arrays process_power_linearity passes in
+        pin_arr = np.asarray(pin, dtype=np.float64)
+        pout_arr = np.asarray(pout, dtype=np.float64)
+        if pin_arr.size < 2 or pout_arr.size < 2:
             return 0.0
         
-        # Calculate small-signal gain (from first few points)
-        small_signal_gain = (pout[1] - pout[0]) / (pin[1] - pin[0])
+        # Incremental gain of every step; the first step is the small-signal gain
+        gains = np.diff(pout_arr)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gains /= np.diff(pin_arr)
+        return self._p1db_from_gains(pout_arr, gains)
+    
+    def _p1db_from_gains(self, pout: np.ndarray, gains: np.ndarray) -> float:
+        """Find P1dB from the incremental gain of every sweep step."""
+        # Find the first step where gain drops by 1dB (argmax returns 0 when none does); the
+        # drop itself is compared, since gains[0] - 1dB can round differently from it
+        gain_drops = gains[0] - gains
+        compressed = gain_drops >= P1DB_THRESHOLD_DB
+        idx = int(np.argmax(compressed))
         
-        # Find where gain drops by 1dB
-        for i in range(len(pin)):
-            if i == 0:
-                continue
-            
-            current_gain = (pout[i] - pout[i-1]) / (pin[i] - pin[i-1])
-            gain_drop = small_signal_gain - current_gain
-            
-            if gain_drop >= P1DB_THRESHOLD_DB:  # 1dB drop
-                # Interpolate to find exact P1dB point
-                if i < len(pin) - 1:
-                    # Linear interpolation
-                    p1db_pout = pout[i-1] + (pout[i] - pout[i-1]) * (1.0 / gain_drop)
-                    return p1db_pout
-                else:
-                    return pout[i]
+        # Interpolated P1dB (the last step has nothing to interpolate towards) or, if no 1dB
+        # compression is found, the highest output power - selected without branching.
+        # Only the first compressed step is interpolated, so a single reciprocal is taken
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv_gain_drop = np.reciprocal(gain_drops[idx])
+            interpolated = pout[idx] + (pout[idx + 1] - pout[idx]) * inv_gain_drop
+        p1db = np.where(idx < len(pout) - 2, interpolated, pout[idx + 1])
+        return float(np.where(compressed[idx], p1db, pout.max()))
+    
+    def _analyze_single_tone(self, pin: np.ndarray, pout: np.ndarray,
+                             target_pins: Optional[np.ndarray]) -> Tuple[float, Optional[np.ndarray]]:
+        """Find P1dB and, if target Pins are given, interpolate Pout at them from the same sweep steps."""
+        if target_pins is None:
+            return self.find_p1db(pin, pout), None
+        if len(pin) != len(pout) or len(pin) < 2:
+            return self.find_p1db(pin, pout), self.interpolate_at_pins(pin, pout, target_pins)
+        
+        # Pin/Pout step sizes, taken once: their ratio is the P1dB step gain, and the
+        # interpolation reads the bracketing step from them
+        pin_steps = np.diff(pin)
+        pout_steps = np.diff(pout)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gains = pout_steps / pin_steps
+        p1db = self._p1db_from_gains(pout, gains)
+        return p1db, self._interpolate_segments(pin, pout, target_pins, (pin_steps, pout_steps))
+    
+    def _interpolate_segments(self, pin: np.ndarray, values: np.ndarray, target_pins,
+                              steps: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+        """Linearly interpolate values (one sweep per row) at the target Pins of an ascending Pin grid."""
+        # First segment with pin[i] <= target <= pin[i+1] (side='left' skips a zero-width segment
+        # from a repeated Pin); clamping to the end segments makes targets outside the range
+        # extrapolate with the same formula
+        idx = np.clip(np.searchsorted(pin, target_pins, side='left') - 1, 0, len(pin) - 2)
+        if steps is None:
+            ratio = (target_pins - pin[idx]) / (pin[idx + 1] - pin[idx])
+            return values[..., idx] + ratio * (values[..., idx + 1] - values[..., idx])
         
-        # If no 1dB compression found, return highest output power
-        return max(pout)
+        # Precomputed np.diff steps of a single sweep
+        pin_steps, value_steps = steps
+        ratio = (target_pins - pin[idx]) / pin_steps[idx]
+        return values[idx] + ratio * value_steps[idx]
     
-    def interpolate_at_pin(self, pin: List[float], values: List[float], target_pin: float) -> float:
+    def interpolate_at_pin(self, pin: np.ndarray, values: np.ndarray, target_pin: float) -> float:
         """Interpolate values at a specific Pin level."""
         if len(pin) != len(values) or len(pin) < 2:
             return 0.0
         
-        # Ensure all pin values are floats
-        pin = [float(p) for p in pin]
-        values = [float(v) for v in values]
-        target_pin = float(target_pin)
-        
-        # Find the two points to interpolate between
-        for i in range(len(pin) - 1):
-            if pin[i] <= target_pin <= pin[i + 1]:
-                # Linear interpolation
-                ratio = (target_pin - pin[i]) / (pin[i + 1] - pin[i])
-                interpolated_value = values[i] + ratio * (values[i + 1] - values[i])
-                return interpolated_value
-        
-        # If target_pin is outside range, extrapolate
-        if target_pin < pin[0]:
-            # Extrapolate backwards
-            ratio = (target_pin - pin[0]) / (pin[1] - pin[0])
-            return values[0] + ratio * (values[1] - values[0])
-        else:
-            # Extrapolate forwards
-            ratio = (target_pin - pin[-2]) / (pin[-1] - pin[-2])
-            return values[-2] + ratio * (values[-1] - values[-2])
+        pin = np.asarray(pin, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        return float(self._interpolate_segments(pin, values, float(target_pin)))
+    
+    def interpolate_at_pins(self, pin: np.ndarray, values: np.ndarray, target_pins) -> np.ndarray:
+        """Interpolate values at several Pin levels in one call."""
+        target_pins = np.asarray(target_pins, dtype=np.float64)
+        if len(pin) != len(values) or len(pin) < 2:
+            return np.zeros_like(target_pins)
+        
+        pin = np.asarray(pin, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        return self._interpolate_segments(pin, values, target_pins)
+    
+    def _requirement_arrays(self, req_list: List[PinPoutIM3Requirement]) -> np.ndarray:
+        """Get the Pin, Pout and IM3 limits of the requirements as the rows of one 3 x N float64 array."""
+        values = np.array([(req.pin_dbm, req.pout_min_dbm, req.im3_max_dbc) for req in req_list],
+                          dtype=np.float64).reshape(-1, 3)
+        return np.ascontiguousarray(values.T)
+    
+    def pin_pout_im3_rows(self, pin_pout_im3_results: Optional[Dict[str, np.ndarray]]) -> List[Dict[str, any]]:
+        """Convert the parallel-array Pin-Pout-IM3 results into one dict per requirement."""
+        if not pin_pout_im3_results:
+            return []
+        keys = list(pin_pout_im3_results)
+        columns = [pin_pout_im3_results[key].tolist() for key in keys]
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+    
+    def _interpolate_shared_grid(self, sorted_by_freq: Dict[float, Dict[str, np.ndarray]], pin_key: str,
+                                 value_key: str, target_pins: np.ndarray) -> Optional[Dict[float, np.ndarray]]:
+        """Interpolate every frequency at the target Pins in one batch, or None if the Pin grids differ."""
+        arrays = list(sorted_by_freq.values())
+        if len(arrays) < 2:
+            return None
+        
+        pin = arrays[0][pin_key]
+        if len(pin) < 2 or any(len(a[value_key]) != len(pin) or not np.array_equal(a[pin_key], pin)
+                               for a in arrays):
+            return None
+        
+        # (n_freq, n_pin) matrix - one segment lookup serves every row
+        values = np.vstack([a[value_key] for a in arrays])
+        interpolated = self._interpolate_segments(pin, values, target_pins)
+        
+        return dict(zip(sorted_by_freq.keys(), interpolated))
+    
+    def _pin_order(self, pin: np.ndarray):
+        """Get the stable Pin sort order, or a full slice (a view, no copy) when Pin is already ascending."""
+        # One O(N) monotonicity check instead of an O(N log N) argsort; NaN Pins fail it and get sorted
+        if len(pin) < 2 or bool((pin[1:] >= pin[:-1]).all()):
+            return slice(None)
+        return np.argsort(pin, kind='stable')
+    
+    def _prepare_freq_arrays(self, freq_data: Dict[str, any]) -> Dict[str, np.ndarray]:
+        """Get the Pin-sorted float64 arrays for one frequency."""
+        # Columns are float64 ndarrays already (converted once by PowerLinearityData);
+        # sweeps that are already in Pin order (the usual case) are used as they are
+        st_pin = freq_data['single_tone_pin']
+        st_order = self._pin_order(st_pin)
+        tt_pin = freq_data['two_tone_pin']
+        tt_order = self._pin_order(tt_pin)
+        
+        sorted_arrays = {
+            'single_tone_pin': st_pin[st_order],
+            'single_tone_pout': freq_data['single_tone_pout'][st_order],
+            'two_tone_pin': tt_pin[tt_order]
+        }
+        # Sidebands fall back to the combined IM3/IM5 when not available separately
+        for key in ('two_tone_im3', 'two_tone_im5'):
+            combined = freq_data[key][tt_order]
+            sorted_arrays[key] = combined
+            for sideband in ('_lower', '_upper'):
+                sideband_data = freq_data.get(key + sideband)
+                if sideband_data is None or sideband_data is freq_data[key]:
+                    sorted_arrays[key + sideband] = combined
+                else:
+                    sorted_arrays[key + sideband] = sideband_data[tt_order]
+        
+        return sorted_arrays
+    
+    def _sorted_by_frequency(self, power_data: PowerLinearityData) -> Dict[float, Dict[str, np.ndarray]]:
+        """Get the Pin-sorted arrays of every frequency, cached per data object (not on the data itself)."""
+        cached = self._sorted_cache.get(id(power_data))
+        if cached is not None and cached[0] is power_data:
+            self._sorted_cache.move_to_end(id(power_data))
+            return cached[1]
+        
+        sorted_by_freq = {freq: self._prepare_freq_arrays(freq_data)
+                          for freq, freq_data in power_data.freq_data.items()}
+        self._sorted_cache[id(power_data)] = (power_data, sorted_by_freq)
+        if len(self._sorted_cache) > _RESULTS_CACHE_SIZE:
+            self._sorted_cache.popitem(last=False)
+        return sorted_by_freq
+    
+    def _process_frequency(self, freq: float, freq_data: Dict[str, np.ndarray], sorted_arrays: Dict[str, np.ndarray],
+                           requirements: TestStageRequirements, req_pins: np.ndarray, req_pout_min: np.ndarray,
+                           req_im3_max: np.ndarray, pout_at_pins: Optional[np.ndarray],
+                           im3_at_pins: Optional[np.ndarray]) -> Dict[str, any]:
+        """Process one frequency (Pout/IM3 at the required Pins are interpolated here unless batched)."""
+        # Get data for this specific frequency
+        single_tone_pin = freq_data['single_tone_pin']
+        single_tone_pout = freq_data['single_tone_pout']
+        two_tone_pin = freq_data['two_tone_pin']
+        two_tone_im3 = freq_data['two_tone_im3']
+        two_tone_im5 = freq_data['two_tone_im5']
+        
+        single_tone_pin_arr = sorted_arrays['single_tone_pin']
+        single_tone_pout_arr = sorted_arrays['single_tone_pout']
+        two_tone_pin_arr = sorted_arrays['two_tone_pin']
+        two_tone_im3_arr = sorted_arrays['two_tone_im3']
+        
+        # Get separate upper/lower sideband data if available
+        two_tone_im3_lower = freq_data.get('two_tone_im3_lower', two_tone_im3)
+        two_tone_im3_upper = freq_data.get('two_tone_im3_upper', two_tone_im3)
+        two_tone_im5_lower = freq_data.get('two_tone_im5_lower', two_tone_im5)
+        two_tone_im5_upper = freq_data.get('two_tone_im5_upper', two_tone_im5)
+        
+        # Calculate P1dB, together with Pout at every required Pin when it wasn't batched across frequencies
+        p1db, pout_interpolated = self._analyze_single_tone(
+            single_tone_pin_arr, single_tone_pout_arr, req_pins if pout_at_pins is None else None)
+        if pout_at_pins is None:
+            pout_at_pins = pout_interpolated
+        
+        # Check Pin-Pout-IM3 requirements - interpolate IM3 at every required Pin at once
+        if im3_at_pins is None:
+            im3_at_pins = self.interpolate_at_pins(two_tone_pin_arr, two_tone_im3_arr, req_pins)
+        pout_pass_mask = pout_at_pins >= req_pout_min
+        im3_pass_mask = im3_at_pins < req_im3_max  # More negative is better
+        overall_pass_mask = pout_pass_mask & im3_pass_mask
+        
+        # Pin-Pout-IM3 results as parallel arrays, one entry per requirement
+        pin_pout_im3_results = {
+            'pin_dbm': req_pins,
+            'pout_measured': pout_at_pins,
+            'pout_required': req_pout_min,
+            'pout_pass': pout_pass_mask,
+            'im3_measured': im3_at_pins,
+            'im3_required': req_im3_max,
+            'im3_pass': im3_pass_mask,
+            'overall_pass': overall_pass_mask
+        }
+        
+        # Determine overall pass/fail
+        p1db_pass = p1db >= requirements.p1db_min_dbm
+        pin_pout_im3_pass = bool(overall_pass_mask.all())  # One boolean reduction, no per-requirement dicts
+        overall_pass = p1db_pass and pin_pout_im3_pass
+        
+        return {
+            'frequency': freq,
+            'single_tone_pin': single_tone_pin,
+            'single_tone_pout': single_tone_pout,
+            'two_tone_pin': two_tone_pin,
+            'two_tone_im3': two_tone_im3,
+            'two_tone_im5': two_tone_im5,
+            'two_tone_im3_lower': two_tone_im3_lower,
+            'two_tone_im3_upper': two_tone_im3_upper,
+            'two_tone_im5_lower': two_tone_im5_lower,
+            'two_tone_im5_upper': two_tone_im5_upper,
+            'p1db': p1db,
+            'p1db_pass': p1db_pass,
+            'pin_pout_im3_results': pin_pout_im3_results,
+            'pin_pout_im3_pass': pin_pout_im3_pass,
+            'overall_pass': overall_pass
+        }
     
     def process_power_linearity(self, power_data: PowerLinearityData,
                                dut_config: DUTConfiguration,
                                test_stage: str) -> Dict[str, Dict[str, any]]:
         """Process power and linearity data and calculate all requirements."""
         # Get requirements for the test stage
-        if test_stage == TEST_STAGES["board_bringup"]:
-            requirements = dut_config.board_bringup
-        elif test_stage == TEST_STAGES["sit"]:
-            requirements = dut_config.sit
-        elif test_stage == TEST_STAGES["test_campaign"]:
-            requirements = dut_config.test_campaign
-        else:
+        requirements = dut_config.get_requirements(test_stage)
+        if requirements is None:
             raise ValueError(f"Unknown test stage: {test_stage}")
         
-        results = {}
+        # Results only depend on the data and the stage requirements; both are replaced, not
+        # mutated, when reloaded/edited. The cached objects are kept so their ids can't be reused.
+        cache_key = (id(power_data), id(requirements))
+        cached = self._results_cache.get(cache_key)
+        if cached is not None and cached[0] is power_data and cached[1] is requirements:
+            self._results_cache.move_to_end(cache_key)
+            return self._copy_results(cached[2])
+        
+        # Requirement limits as arrays, shared by every frequency
+        req_list = requirements.pin_pout_im3_requirements
+        req_pins, req_pout_min, req_im3_max = self._requirement_arrays(req_list)
+        
+        # Pin-sorted arrays per frequency, kept in _sorted_cache and shared by P1dB and interpolation
+        sorted_by_freq = self._sorted_by_frequency(power_data)
+        
+        # When every frequency was swept over the same Pin grid, interpolate all of them in one batch
+        pout_rows = self._interpolate_shared_grid(sorted_by_freq, 'single_tone_pin', 'single_tone_pout', req_pins)
+        im3_rows = self._interpolate_shared_grid(sorted_by_freq, 'two_tone_pin', 'two_tone_im3', req_pins)
         
         # Process each frequency using the frequency-specific data
-        for freq in power_data.freq_data.keys():
-            # Get data for this specific frequency
-            freq_data = power_data.freq_data[freq]
-            single_tone_pin = freq_data['single_tone_pin']
-            single_tone_pout = freq_data['single_tone_pout']
-            two_tone_pin = freq_data['two_tone_pin']
-            two_tone_im3 = freq_data['two_tone_im3']
-            two_tone_im5 = freq_data['two_tone_im5']
-            
-            # Get separate upper/lower sideband data if available
-            two_tone_im3_lower = freq_data.get('two_tone_im3_lower', two_tone_im3)
-            two_tone_im3_upper = freq_data.get('two_tone_im3_upper', two_tone_im3)
-            two_tone_im5_lower = freq_data.get('two_tone_im5_lower', two_tone_im5)
-            two_tone_im5_upper = freq_data.get('two_tone_im5_upper', two_tone_im5)
-            
-            # Calculate P1dB
-            p1db = self.find_p1db(single_tone_pin, single_tone_pout)
-            
-            # Check Pin-Pout-IM3 requirements
-            pin_pout_im3_results = []
-            for req in requirements.pin_pout_im3_requirements:
-                # Interpolate Pout at required Pin
-                pout_at_pin = self.interpolate_at_pin(single_tone_pin, single_tone_pout, req.pin_dbm)
-                
-                # Interpolate IM3 at required Pin
-                im3_at_pin = self.interpolate_at_pin(two_tone_pin, two_tone_im3, req.pin_dbm)
-                
-                # Check requirements
-                pout_pass = pout_at_pin >= req.pout_min_dbm
-                im3_pass = im3_at_pin < req.im3_max_dbc  # More negative is better
-                
-                pin_pout_im3_results.append({
-                    'pin_dbm': req.pin_dbm,
-                    'pout_measured': pout_at_pin,
-                    'pout_required': req.pout_min_dbm,
-                    'pout_pass': pout_pass,
-                    'im3_measured': im3_at_pin,
-                    'im3_required': req.im3_max_dbc,
-                    'im3_pass': im3_pass,
-                    'overall_pass': pout_pass and im3_pass
-                })
-            
-            # Determine overall pass/fail
-            p1db_pass = p1db >= requirements.p1db_min_dbm
-            pin_pout_im3_pass = all(result['overall_pass'] for result in pin_pout_im3_results)
-            overall_pass = p1db_pass and pin_pout_im3_pass
-            
-            results[freq] = {
-                'frequency': freq,
-                'single_tone_pin': single_tone_pin,
-                'single_tone_pout': single_tone_pout,
-                'two_tone_pin': two_tone_pin,
-                'two_tone_im3': two_tone_im3,
-                'two_tone_im5': two_tone_im5,
-                'two_tone_im3_lower': two_tone_im3_lower,
-                'two_tone_im3_upper': two_tone_im3_upper,
-                'two_tone_im5_lower': two_tone_im5_lower,
-                'two_tone_im5_upper': two_tone_im5_upper,
-                'p1db': p1db,
-                'p1db_pass': p1db_pass,
-                'pin_pout_im3_results': pin_pout_im3_results,
-                'pin_pout_im3_pass': pin_pout_im3_pass,
-                'overall_pass': overall_pass
-            }
+        results = {}
+        for freq, freq_data in power_data.freq_data.items():
+            results[freq] = self._process_frequency(
+                freq, freq_data, sorted_by_freq[freq], requirements, req_pins, req_pout_min, req_im3_max,
+                pout_rows[freq] if pout_rows is not None else None,
+                im3_rows[freq] if im3_rows is not None else None)
         
-        return results
+        self._results_cache[cache_key] = (power_data, requirements, results)
+        if len(self._results_cache) > _RESULTS_CACHE_SIZE:
+            self._results_cache.popitem(last=False)
+        
+        return self._copy_results(results)
+    
+    def _copy_results(self, results: Dict[float, Dict[str, any]]) -> Dict[float, Dict[str, any]]:
+        """Copy the result dicts so callers adding or replacing entries can't change the cached results."""
+        return {freq: {**result_data, 'pin_pout_im3_results': dict(result_data['pin_pout_im3_results'])}
+                for freq, result_data in results.items()}
     
     def get_plot_data(self, results: Dict[str, Dict[str, any]], 
                      plot_type: str, dut_config, temperature_data: List[float] = None, test_stage: str = "board_bringup") -> Dict[str, any]:
         """Get data for plotting."""
         plot_data = {}
         
-        # Define colors for different frequencies
-        colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
+        # Get requirements for the current test stage (loop-invariant)
+        requirements = dut_config.get_requirements(test_stage) or dut_config.board_bringup
+        req_list = requirements.pin_pout_im3_requirements
+        
+        # Operational range limits, computed once and shared by every file/frequency
+        pout_range = im3_range = None
+        if req_list:
+            # Rows: Pin, Pout, IM3 - one min/max/floor/ceil pass covers all three
+            req_values = self._requirement_arrays(req_list)
+            lows = req_values.min(axis=1)
+            highs = req_values.max(axis=1)
+            
+            # Axis limits with 2dB margins, rounded to 0.25 dB increments
+            # (for IM3 plots y_min is more negative (better), y_max less negative (worse))
+            axis_mins = (np.floor((lows - 2.0) * 4) / 4).tolist()
+            axis_maxs = (np.ceil((highs + 2.0) * 4) / 4).tolist()
+            pin_lo, pout_lo, im3_lo = lows.tolist()
+            pin_hi, pout_hi, im3_hi = highs.tolist()
+            x_min, pout_y_min, im3_y_min = axis_mins
+            x_max, pout_y_max, im3_y_max = axis_maxs
+            
+            pout_range = {
+                'default_x_min': x_min,
+                'default_x_max': x_max,
+                'default_y_min': pout_y_min,
+                'default_y_max': pout_y_max,
+                'acceptance_region': {
+                    'pin_min': pin_lo,
+                    'pin_max': pin_hi,
+                    'pout_min': pout_lo,
+                    'pout_max': pout_hi,
+                    'x_min': x_min,
+                    'x_max': x_max,
+                    'y_min': pout_y_min,
+                    'y_max': pout_y_max,
+                    'requirement_points': [(req.pin_dbm, req.pout_min_dbm) for req in req_list]
+                }
+            }
+            im3_range = {
+                'default_x_min': x_min,
+                'default_x_max': x_max,
+                'default_y_min': im3_y_min,
+                'default_y_max': im3_y_max,
+                'acceptance_region': {
+                    'pin_min': pin_lo,
+                    'pin_max': pin_hi,
+                    'im3_min': im3_lo,
+                    'im3_max': im3_hi,
+                    'x_min': x_min,
+                    'x_max': x_max,
+                    'y_min': im3_y_min,
+                    'y_max': im3_y_max,
+                    'requirement_points': [(req.pin_dbm, req.im3_max_dbc) for req in req_list]
+                }
+            }
+        
+        # "x.xx GHz" text per frequency, formatted once and shared by every file
+        freq_labels = {}
         
-        # Define line styles for different file types
-        line_styles = {'PRI': '-', 'RED': '--'}
+        # Plot-type dispatch, titles and sideband selection are loop-invariant
+        is_pout_plot = plot_type in ("compression", "full_power_sweep", "operational_range")
+        is_intermod_plot = plot_type in ("linearity", "im3_operational_range")
+        pout_title = f"Pout vs Pin - {dut_config.name}"
+        if plot_type == "operational_range" and pout_range:
+            pout_title += " (Operational Range)"
+        intermod_title = (f"Linearity - {dut_config.name}" if plot_type == "linearity"
+                          else f"IM3 Operational Range - {dut_config.name}")
+        # IM3 always, IM5 only on the linearity plot
+        sideband_keys = [('IM3 Lower', 'two_tone_im3_lower'), ('IM3 Upper', 'two_tone_im3_upper')]
+        if plot_type == "linearity":
+            sideband_keys += [('IM5 Lower', 'two_tone_im5_lower'), ('IM5 Upper', 'two_tone_im5_upper')]
         
         # Process all files (PRI, RED, etc.)
         for file_key, file_results in results.items():
             if not isinstance(file_results, dict):
                 continue
-                
+            
+            linestyle = _LINE_STYLES.get(file_key, '-')  # Default to solid line
+            
             for i, (freq, result_data) in enumerate(file_results.items()):
-                color = colors[i % len(colors)]
-                linestyle = line_styles.get(file_key, '-')  # Default to solid line
+                color = _PLOT_COLORS[i % len(_PLOT_COLORS)]
                 
                 # Create unique key for each frequency and file combination
                 plot_key = f"{freq}_{file_key}"
-                if plot_type in ["compression", "full_power_sweep"]:
-                    # Sort data by Pin values to ensure proper left-to-right progression
-                    pin_data = result_data['single_tone_pin']
-                    pout_data = result_data['single_tone_pout']
-                    
-                    # Create sorted pairs and then separate back into x and y
-                    sorted_pairs = sorted(zip(pin_data, pout_data), key=lambda pair: pair[0])
-                    sorted_pin, sorted_pout = zip(*sorted_pairs)
+                
+                # Data sorted by Pin values (left-to-right progression), shared by every plot type;
+                # sweeps already in Pin order are used as they are, without copies
+                sorted_arrays = self._prepare_freq_arrays(result_data)
+                
+                # Label shared by every curve of this file/frequency
+                freq_label = freq_labels.get(freq)
+                if freq_label is None:
+                    freq_label = freq_labels[freq] = f"{float(freq):.2f} GHz"
+                curve_label_prefix = f"{file_key} @ {freq_label}"
+                
+                if is_pout_plot:
+                    # Arrays go straight into the plot dicts - the plot windows convert on draw
+                    sorted_pin = sorted_arrays['single_tone_pin']
+                    sorted_pout = sorted_arrays['single_tone_pout']
                     
-                    plot_data[plot_key] = {
-                        'x': list(sorted_pin),
-                        'y': list(sorted_pout),
+                    plot_entry = {
+                        'x': sorted_pin,
+                        'y': sorted_pout,
                         'p1db': result_data['p1db'],
-                        'title': f"Pout vs Pin - {dut_config.name}",
+                        'title': pout_title,
                         'x_label': "Pin (dBm)",
                         'y_label': "Pout (dBm)",
-                        'curves': [{
-                            'x': list(sorted_pin),
-                            'y': list(sorted_pout),
-                            'label': f"{file_key} @ {float(freq):.2f} GHz",
-                            'linestyle': linestyle,
-                            'color': color
-                        }]
+                        'curves': [{'x': sorted_pin, 'y': sorted_pout, 'label': curve_label_prefix,
+                                    'linestyle': linestyle, 'color': color}]
                     }
-                
-                elif plot_type == "operational_range":
-                    # Sort data by Pin values to ensure proper left-to-right progression
-                    pin_data = result_data['single_tone_pin']
-                    pout_data = result_data['single_tone_pout']
-                    
-                    # Create sorted pairs and then separate back into x and y
-                    sorted_pairs = sorted(zip(pin_data, pout_data), key=lambda pair: pair[0])
-                    sorted_pin, sorted_pout = zip(*sorted_pairs)
                     
-                    # Get requirements for the current test stage
-                    if test_stage == "board_bringup":
-                        requirements = dut_config.board_bringup
-                    elif test_stage == "sit":
-                        requirements = dut_config.sit
-                    elif test_stage == "test_campaign":
-                        requirements = dut_config.test_campaign
-                    else:
-                        requirements = dut_config.board_bringup
+                    # Operational range adds its limits; with no requirements it
+                    # falls back to full power sweep behavior
+                    if plot_type == "operational_range" and pout_range:
+                        plot_entry.update(pout_range)
                     
-                    # Calculate operational range limits
-                    if requirements.pin_pout_im3_requirements:
-                        import numpy as np
-                        pin_values = [req.pin_dbm for req in requirements.pin_pout_im3_requirements]
-                        pout_values = [req.pout_min_dbm for req in requirements.pin_pout_im3_requirements]
-                        
-                        # Calculate axis limits with 2dB margins
-                        pin_min = min(pin_values) - 2.0
-                        pin_max = max(pin_values) + 2.0
-                        pout_min = min(pout_values) - 2.0
-                        pout_max = max(pout_values) + 2.0
-                        
-                        # Round to 0.25 dB increments
-                        x_min = np.floor(pin_min * 4) / 4
-                        x_max = np.ceil(pin_max * 4) / 4
-                        y_min = np.floor(pout_min * 4) / 4
-                        y_max = np.ceil(pout_max * 4) / 4
-                        
-                        plot_data[plot_key] = {
-                            'x': list(sorted_pin),
-                            'y': list(sorted_pout),
-                            'p1db': result_data['p1db'],
-                            'title': f"Pout vs Pin - {dut_config.name} (Operational Range)",
-                            'x_label': "Pin (dBm)",
-                            'y_label': "Pout (dBm)",
-                            'default_x_min': x_min,
-                            'default_x_max': x_max,
-                            'default_y_min': y_min,
-                            'default_y_max': y_max,
-                            'acceptance_region': {
-                                'pin_min': min(pin_values),
-                                'pin_max': max(pin_values),
-                                'pout_min': min(pout_values),
-                                'pout_max': max(pout_values),
-                                'x_min': x_min,
-                                'x_max': x_max,
-                                'y_min': y_min,
-                                'y_max': y_max,
-                                'requirement_points': [(req.pin_dbm, req.pout_min_dbm) 
-                                                      for req in requirements.pin_pout_im3_requirements]
-                            },
-                            'curves': [{
-                                'x': list(sorted_pin),
-                                'y': list(sorted_pout),
-                                'label': f"{file_key} @ {float(freq):.2f} GHz",
-                                'linestyle': linestyle,
-                                'color': color
-                            }]
-                        }
-                    else:
-                        # No requirements, fall back to full power sweep behavior
-                        plot_data[plot_key] = {
-                            'x': list(sorted_pin),
-                            'y': list(sorted_pout),
-                    'p1db': result_data['p1db'],
-                            'title': f"Pout vs Pin - {dut_config.name}",
-                    'x_label': "Pin (dBm)",
-                    'y_label': "Pout (dBm)",
-                    'curves': [{
-                                'x': list(sorted_pin),
-                                'y': list(sorted_pout),
-                                'label': f"{file_key} @ {float(freq):.2f} GHz",
-                                'linestyle': linestyle,
-                                'color': color
-                            }]
-                        }
+                    plot_data[plot_key] = plot_entry
                 
                 # Note: Temperature data is not plotted on compression plots
                 # as it doesn't have a meaningful relationship with Pin/Pout
                 
-                if plot_type == "linearity":
-                    # Sort data by Pin values to ensure proper left-to-right progression
-                    pin_data = result_data['two_tone_pin']
-                    
-                    # Get separate upper and lower sideband data if available
-                    im3_lower_data = result_data.get('two_tone_im3_lower', result_data['two_tone_im3'])
-                    im3_upper_data = result_data.get('two_tone_im3_upper', result_data['two_tone_im3'])
-                    im5_lower_data = result_data.get('two_tone_im5_lower', result_data['two_tone_im5'])
-                    im5_upper_data = result_data.get('two_tone_im5_upper', result_data['two_tone_im5'])
-                    
-                    # Create sorted pairs for each sideband
-                    sorted_im3_lower_pairs = sorted(zip(pin_data, im3_lower_data), key=lambda pair: pair[0])
-                    sorted_im3_upper_pairs = sorted(zip(pin_data, im3_upper_data), key=lambda pair: pair[0])
-                    sorted_im5_lower_pairs = sorted(zip(pin_data, im5_lower_data), key=lambda pair: pair[0])
-                    sorted_im5_upper_pairs = sorted(zip(pin_data, im5_upper_data), key=lambda pair: pair[0])
-                    
-                    sorted_pin_im3_lower, sorted_im3_lower = zip(*sorted_im3_lower_pairs)
-                    sorted_pin_im3_upper, sorted_im3_upper = zip(*sorted_im3_upper_pairs)
-                    sorted_pin_im5_lower, sorted_im5_lower = zip(*sorted_im5_lower_pairs)
-                    sorted_pin_im5_upper, sorted_im5_upper = zip(*sorted_im5_upper_pairs)
-                    
-                    # Create 4 curves for IM3/IM5 upper and lower sidebands
-                    curves = []
-                    
-                    # IM3 Lower and Upper
-                    curves.append({
-                        'x': list(sorted_pin_im3_lower),
-                        'y': list(sorted_im3_lower),
-                        'label': f'IM3 Lower {file_key} @ {float(freq):.2f} GHz',
-                        'linestyle': linestyle,
-                        'color': color
-                    })
-                    curves.append({
-                        'x': list(sorted_pin_im3_upper),
-                        'y': list(sorted_im3_upper),
-                        'label': f'IM3 Upper {file_key} @ {float(freq):.2f} GHz',
-                        'linestyle': linestyle,
-                        'color': color
-                    })
-                    
-                    # IM5 Lower and Upper
-                    curves.append({
-                        'x': list(sorted_pin_im5_lower),
-                        'y': list(sorted_im5_lower),
-                        'label': f'IM5 Lower {file_key} @ {float(freq):.2f} GHz',
-                        'linestyle': linestyle,
-                        'color': color
-                    })
-                    curves.append({
-                        'x': list(sorted_pin_im5_upper),
-                        'y': list(sorted_im5_upper),
-                        'label': f'IM5 Upper {file_key} @ {float(freq):.2f} GHz',
-                        'linestyle': linestyle,
-                        'color': color
-                    })
-                    
-                    plot_data[plot_key] = {
-                        'title': f"Linearity - {dut_config.name}",
-                        'x_label': "Pin (dBm)",
-                        'y_label': "IM3/IM5 (dBc)",
-                        'curves': curves
-                    }
-                
-                elif plot_type == "im3_operational_range":
-                    # Sort data by Pin values to ensure proper left-to-right progression
-                    pin_data = result_data['two_tone_pin']
-                    
-                    # Get separate upper and lower sideband data if available
-                    im3_lower_data = result_data.get('two_tone_im3_lower', result_data['two_tone_im3'])
-                    im3_upper_data = result_data.get('two_tone_im3_upper', result_data['two_tone_im3'])
+                if is_intermod_plot:
+                    sorted_tt_pin = sorted_arrays['two_tone_pin']
                     
-                    # Create sorted pairs for each sideband
-                    sorted_im3_lower_pairs = sorted(zip(pin_data, im3_lower_data), key=lambda pair: pair[0])
-                    sorted_im3_upper_pairs = sorted(zip(pin_data, im3_upper_data), key=lambda pair: pair[0])
+                    # Separate upper and lower sideband data, one dict per curve built in a single expression
+                    # (aliased sidebands share one array but keep their own curve so the sideband filter works)
+                    curves = [{'x': sorted_tt_pin, 'y': sorted_arrays[key], 'label': f"{name} {curve_label_prefix}",
+                               'linestyle': linestyle, 'color': color}
+                              for name, key in sideband_keys]
                     
-                    sorted_pin_im3_lower, sorted_im3_lower = zip(*sorted_im3_lower_pairs)
-                    sorted_pin_im3_upper, sorted_im3_upper = zip(*sorted_im3_upper_pairs)
-                    
-                    # Create 2 curves for IM3 Lower and Upper only
-                    curves = []
-                    
-                    # IM3 Lower and Upper
-                    curves.append({
-                        'x': list(sorted_pin_im3_lower),
-                        'y': list(sorted_im3_lower),
-                        'label': f'IM3 Lower {file_key} @ {float(freq):.2f} GHz',
-                        'linestyle': linestyle,
-                        'color': color
-                    })
-                    curves.append({
-                        'x': list(sorted_pin_im3_upper),
-                        'y': list(sorted_im3_upper),
-                        'label': f'IM3 Upper {file_key} @ {float(freq):.2f} GHz',
-                        'linestyle': linestyle,
-                        'color': color
-                    })
-                    
-                    # Get requirements for the current test stage
-                    if test_stage == "board_bringup":
-                        requirements = dut_config.board_bringup
-                    elif test_stage == "sit":
-                        requirements = dut_config.sit
-                    elif test_stage == "test_campaign":
-                        requirements = dut_config.test_campaign
-                    else:
-                        requirements = dut_config.board_bringup
-                    
-                    # Calculate operational range limits with 2dB margins
-                    if requirements.pin_pout_im3_requirements:
-                        import numpy as np
-                        pin_values = [req.pin_dbm for req in requirements.pin_pout_im3_requirements]
-                        im3_values = [req.im3_max_dbc for req in requirements.pin_pout_im3_requirements]
-                        
-                        # Calculate axis limits with 2dB margins
-                        pin_min = min(pin_values) - 2.0
-                        pin_max = max(pin_values) + 2.0
-                        im3_min = min(im3_values) - 2.0
-                        im3_max = max(im3_values) + 2.0
-                        
-                        # Round to 0.25 dB increments
-                        x_min = np.floor(pin_min * 4) / 4
-                        x_max = np.ceil(pin_max * 4) / 4
-                        # For IM3 plots, y_min should be more negative (better), y_max should be less negative (worse)
-                        y_min = np.floor(im3_min * 4) / 4  # More negative (better)
-                        y_max = np.ceil(im3_max * 4) / 4   # Less negative (worse)
-                        
+                    if plot_type == "linearity":
                         plot_data[plot_key] = {
-                            'title': f"IM3 Operational Range - {dut_config.name}",
+                            'title': intermod_title,
                             'x_label': "Pin (dBm)",
-                            'y_label': "IM3 (dBc)",
-                            'curves': curves,
-                            'default_x_min': x_min,
-                            'default_x_max': x_max,
-                            'default_y_min': y_min,
-                            'default_y_max': y_max,
-                            'acceptance_region': {
-                                'pin_min': min(pin_values),
-                                'pin_max': max(pin_values),
-                                'im3_min': min(im3_values),
-                                'im3_max': max(im3_values),
-                                'x_min': x_min,
-                                'x_max': x_max,
-                                'y_min': y_min,
-                                'y_max': y_max,
-                                'requirement_points': [(req.pin_dbm, req.im3_max_dbc)
-                                                      for req in requirements.pin_pout_im3_requirements]
-                            }
+                            'y_label': "IM3/IM5 (dBc)",
+                            'curves': curves
                         }
                     else:
-                        plot_data[plot_key] = {
-                            'title': f"IM3 Operational Range - {dut_config.name}",
+                        plot_entry = {
+                            'title': intermod_title,
                             'x_label': "Pin (dBm)",
                             'y_label': "IM3 (dBc)",
-                    'curves': curves
-                }
+                            'curves': curves
+                        }
+                        
+                        if im3_range:
+                            plot_entry.update(im3_range)
+                        
+                        plot_data[plot_key] = plot_entry
                 
                 # Add temperature on secondary Y-axis
                 if temperature_data:
@@ -2,126 +2,239 @@
 S-parameter processing and calculations
 """
 
+import logging
 import numpy as np
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Optional
 from src.models.test_data import SParameterData
 from src.models.dut_config import DUTConfiguration, TestStageRequirements, OutOfBandRequirement
-from src.constants import TEST_STAGES, DEFAULT_TEST_STAGE, PLOT_EXPANSION_FACTOR, VSWR_Y_AXIS_EXPANSION_FACTOR
+from src.constants import DEFAULT_TEST_STAGE, PLOT_EXPANSION_FACTOR, VSWR_Y_AXIS_EXPANSION_FACTOR
+
+logger = logging.getLogger(__name__)
+
+# Number of (frequency sweep, range) index pairs kept by SParameterProcessor
+_RANGE_CACHE_SIZE = 64
+
+# Number of processed (data, DUT configuration, test stage) results kept by SParameterProcessor
+_RESULTS_CACHE_SIZE = 8
+
+# Largest |S11| below 1 - clamping to it keeps the VSWR denominator non-zero
+# without changing any |S11| < 1
+_MAX_REFLECTION = np.nextafter(1.0, 0.0)
+
+# Plot colors for different S-parameters and line styles for PRI/RED distinction
+_PLOT_COLORS = ('blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray')
+_LINE_STYLES = {'PRI': '-', 'RED': '--'}
 
 class SParameterProcessor:
     """Processor for S-parameter calculations and analysis."""
     
     def __init__(self):
-        pass
+        # (id(freq_array), freq_min, freq_max) -> (freq_array, (min_idx, max_idx)), least recently used first
+        self._range_cache = OrderedDict()
+        # (id(s_param_data), id(dut_config), test_stage) -> (s_param_data, dut_config, results), least recently used first
+        self._results_cache = OrderedDict()
     
-    def calculate_gain(self, s_param: List[complex]) -> List[float]:
+    def calculate_gain(self, s_param: np.ndarray) -> np.ndarray:
         """Calculate gain in dB from S-parameter magnitude."""
-        return [20 * np.log10(abs(s)) for s in s_param]
+        # 20*log10(|S|) = 10*log10(|S|^2): the squared magnitude needs no sqrt, and
+        # the log is taken in place in that one buffer
+        s_param = np.asarray(s_param)
+        return self._gain_from_parts(s_param.real, s_param.imag)
+    
+    def _gain_from_parts(self, s_real: np.ndarray, s_imag: np.ndarray) -> np.ndarray:
+        """Calculate gain in dB from the real and imaginary parts of an S-parameter."""
+        gain = s_real * s_real
+        gain += s_imag * s_imag
+        np.log10(gain, out=gain)
+        gain *= 10.0
+        return gain
     
-    def calculate_vswr(self, s11: List[complex]) -> List[float]:
+    def calculate_vswr(self, s11: np.ndarray) -> np.ndarray:
         """Calculate VSWR from S11 reflection coefficient."""
-        vswr = []
-        for s in s11:
-            magnitude = abs(s)
-            if magnitude >= 1.0:
-                # Cap at reasonable maximum instead of infinity
-                vswr.append(1000.0)  # Very high VSWR but finite
-            else:
-                vswr.append((1 + magnitude) / (1 - magnitude))
-        return vswr
+        # hypot of the parts, as process_s_parameters uses - the SIMD np.abs on complex arrays can
+        # round |S11| = 1 down by one ulp, which would skip the 1000 cap
+        s11 = np.asarray(s11)
+        return self._vswr_from_magnitude(np.hypot(s11.real, s11.imag))
+    
+    def _vswr_from_magnitude(self, magnitude: np.ndarray) -> np.ndarray:
+        """Calculate VSWR from the reflection coefficient magnitude |S11|."""
+        # The clamped denominator is never zero, so no floating-point error state to suppress
+        vswr = (1.0 + magnitude) / (1.0 - np.minimum(magnitude, _MAX_REFLECTION))
+        # Cap at reasonable maximum instead of infinity (|S11| >= 1)
+        return np.where(magnitude >= 1.0, 1000.0, vswr)
+    
+    def _nearest_index(self, freq_array: np.ndarray, target: float) -> int:
+        """Get the index of the frequency nearest to target (first on ties) by bisecting the ascending sweep."""
+        # Same point as argmin(|freq - target|) without the O(N) temporaries: the nearest
+        # frequency is one of the two neighbours of the insertion point
+        idx = int(np.searchsorted(freq_array, target, side='left'))
+        if idx == len(freq_array) or (idx > 0 and target - freq_array[idx - 1] <= freq_array[idx] - target):
+            # First occurrence of the lower neighbour - only searched for when the sweep repeats it
+            if idx > 1 and freq_array[idx - 2] == freq_array[idx - 1]:
+                return int(np.searchsorted(freq_array, freq_array[idx - 1], side='left'))
+            return idx - 1
+        return idx
     
-    def find_frequency_range_indices(self, frequencies: List[float], 
+    def find_frequency_range_indices(self, frequencies: np.ndarray, 
                                    freq_min: float, freq_max: float) -> Tuple[int, int]:
-        """Find indices for a frequency range."""
-        freq_array = np.array(frequencies)
-        min_idx = np.argmin(np.abs(freq_array - freq_min))
-        max_idx = np.argmin(np.abs(freq_array - freq_max))
+        """Find indices for a frequency range (freq_min <= freq_max)."""
+        if freq_min > freq_max:
+            raise ValueError(f"Frequency range must be ordered: {freq_min} > {freq_max}")
+        freq_array = np.asarray(frequencies, dtype=np.float64)  # No copy for float64 ndarrays (SParameterData)
+        
+        # Any other input is converted into a new array on every call - nothing to reuse, so it
+        # isn't cached (and the cache doesn't keep those temporary arrays alive)
+        if freq_array is not frequencies:
+            return self._nearest_index(freq_array, freq_min), self._nearest_index(freq_array, freq_max)
+        
+        # The same bands are looked up for every S-parameter, OoB requirement and plot of a file;
+        # the sweep array itself is kept in the cache so its id can't be reused
+        cache_key = (id(freq_array), freq_min, freq_max)
+        cached = self._range_cache.get(cache_key)
+        if cached is not None and cached[0] is freq_array:
+            self._range_cache.move_to_end(cache_key)
+            return cached[1]
+        
+        min_idx = self._nearest_index(freq_array, freq_min)
+        max_idx = self._nearest_index(freq_array, freq_max)
         
-        # Ensure min_idx <= max_idx
-        if min_idx > max_idx:
-            min_idx, max_idx = max_idx, min_idx
+        self._range_cache[cache_key] = (freq_array, (min_idx, max_idx))
+        if len(self._range_cache) > _RANGE_CACHE_SIZE:
+            self._range_cache.popitem(last=False)
         
         return min_idx, max_idx
     
-    def calculate_in_band_gain(self, frequencies: List[float], gain: List[float],
+    def calculate_in_band_gain(self, frequencies: np.ndarray, gain: np.ndarray,
                              freq_min: float, freq_max: float) -> Dict[str, float]:
         """Calculate in-band gain statistics."""
-        min_idx, max_idx = self.find_frequency_range_indices(frequencies, freq_min, freq_max)
-        
-        gain_in_band = gain[min_idx:max_idx+1]
+        return self._in_band_gain_stats(
+            np.asarray(gain), self.find_frequency_range_indices(frequencies, freq_min, freq_max))
+    
+    def _in_band_gain_stats(self, gain: np.ndarray, band: Tuple[int, int]) -> Dict[str, float]:
+        """Calculate gain statistics over precomputed (min_idx, max_idx) band indices."""
+        # Slice view, one NumPy reduction each for min and max
+        gain_in_band = gain[band[0]:band[1]+1]
+        min_gain = float(gain_in_band.min())
+        max_gain = float(gain_in_band.max())
         
         return {
-            'min_gain': min(gain_in_band),
-            'max_gain': max(gain_in_band),
-            'flatness': max(gain_in_band) - min(gain_in_band)
+            'min_gain': min_gain,
+            'max_gain': max_gain,
+            'flatness': max_gain - min_gain
         }
     
-    def calculate_vswr_max(self, frequencies: List[float], vswr: List[float],
+    def calculate_vswr_max(self, frequencies: np.ndarray, vswr: np.ndarray,
                           freq_min: float, freq_max: float) -> float:
         """Calculate maximum VSWR in frequency range."""
-        min_idx, max_idx = self.find_frequency_range_indices(frequencies, freq_min, freq_max)
-        
-        vswr_in_band = vswr[min_idx:max_idx+1]
-        # Filter out infinite values
-        vswr_finite = [v for v in vswr_in_band if v != float('inf')]
-        
-        return max(vswr_finite) if vswr_finite else 0.0
+        return self._vswr_max_in_band(
+            np.asarray(vswr), self.find_frequency_range_indices(frequencies, freq_min, freq_max))
+    
+    def _vswr_max_in_band(self, vswr: np.ndarray, band: Tuple[int, int], capped: bool = False) -> float:
+        """Calculate maximum VSWR over precomputed (min_idx, max_idx) band indices."""
+        vswr_in_band = vswr[band[0]:band[1]+1]
+        if capped:
+            # VSWR from calculate_vswr is capped at 1000, never infinite: a plain NaN-skipping
+            # maximum, without building a finite mask
+            return float(np.fmax.reduce(vswr_in_band, initial=0.0))
+        # Maximum over the finite values only, 0.0 when there are none
+        return float(np.max(vswr_in_band, where=np.isfinite(vswr_in_band), initial=0.0))
     
-    def calculate_out_of_band_rejection(self, frequencies: List[float], gain: List[float],
+    def calculate_out_of_band_rejection(self, frequencies: np.ndarray, gain: np.ndarray,
                                       oob_requirement: OutOfBandRequirement,
                                       operational_min: float, operational_max: float) -> Dict[str, float]:
         """Calculate out-of-band rejection."""
-        # Find worst-case (lowest) gain in operational band
-        op_min_idx, op_max_idx = self.find_frequency_range_indices(
-            frequencies, operational_min, operational_max)
-        gain_operational = gain[op_min_idx:op_max_idx+1]
-        worst_case_operational = min(gain_operational)
-        
-        # Find worst-case (highest) gain in OoB range
-        oob_min_idx, oob_max_idx = self.find_frequency_range_indices(
-            frequencies, oob_requirement.freq_min, oob_requirement.freq_max)
-        gain_oob = gain[oob_min_idx:oob_max_idx+1]
-        worst_case_oob = max(gain_oob)
-        
-        # Calculate rejection
-        rejection = worst_case_operational - worst_case_oob
-        
-        print(f"DEBUG OoB Calculation:")
-        print(f"  Operational range: {operational_min:.3f} to {operational_max:.3f} GHz")
-        print(f"  OoB range: {oob_requirement.freq_min:.3f} to {oob_requirement.freq_max:.3f} GHz")
-        print(f"  Worst-case operational gain: {worst_case_operational:.2f} dB")
-        print(f"  Worst-case OoB gain: {worst_case_oob:.2f} dB")
-        print(f"  Calculated rejection: {rejection:.2f} dB")
-        print(f"  Required rejection: {oob_requirement.rejection_db:.2f} dB")
-        print(f"  Pass: {rejection > oob_requirement.rejection_db}")
+        return self.calculate_out_of_band_rejections(
+            frequencies, gain, [oob_requirement], operational_min, operational_max)[0]
+    
+    def calculate_out_of_band_rejections(self, frequencies: np.ndarray, gain: np.ndarray,
+                                         oob_requirements: List[OutOfBandRequirement],
+                                         operational_min: float, operational_max: float,
+                                         worst_case_operational: Optional[float] = None) -> List[Dict[str, float]]:
+        """Calculate out-of-band rejection for several OoB requirements at once."""
+        if not oob_requirements:
+            return []
+        gain = np.asarray(gain)
         
-        return {
-            'rejection_db': rejection,
-            'worst_case_operational': worst_case_operational,
-            'worst_case_oob': worst_case_oob,
-            'requirement': oob_requirement.rejection_db,
-            'pass': rejection > oob_requirement.rejection_db
-        }
+        # Find worst-case (lowest) gain in operational band - shared by every OoB requirement
+        # (callers that already have the in-band minimum pass it in)
+        if worst_case_operational is None:
+            op_min_idx, op_max_idx = self.find_frequency_range_indices(
+                frequencies, operational_min, operational_max)
+            worst_case_operational = float(gain[op_min_idx:op_max_idx+1].min())
+        
+        worst_case_oobs = self._oob_worst_cases(gain, self._oob_bounds(frequencies, oob_requirements))
+        return self._oob_results(oob_requirements, worst_case_operational, worst_case_oobs,
+                                 operational_min, operational_max)
+    
+    def _oob_bounds(self, frequencies: np.ndarray, oob_requirements: List[OutOfBandRequirement]) -> np.ndarray:
+        """Get the (min_idx, max_idx) indices of every OoB range as an n x 2 array."""
+        return np.array([self.find_frequency_range_indices(frequencies, req.freq_min, req.freq_max)
+                         for req in oob_requirements], dtype=np.intp).reshape(-1, 2)
+    
+    def _oob_worst_cases(self, gain: np.ndarray, oob_bounds: np.ndarray) -> np.ndarray:
+        """Find the worst-case (highest) gain in every OoB range of precomputed indices."""
+        if not len(oob_bounds):
+            return np.empty(0)
+        # One reduceat over the (start, end) index pairs gives max(gain[start:end]) at every other
+        # position (gain[start] when start == end), and the inclusive end point is folded in afterwards
+        return np.maximum(np.maximum.reduceat(gain, oob_bounds.ravel())[::2], gain[oob_bounds[:, 1]])
+    
+    def _oob_results(self, oob_requirements: List[OutOfBandRequirement], worst_case_operational: float,
+                     worst_case_oobs: np.ndarray, operational_min: float, operational_max: float) -> List[Dict[str, float]]:
+        """Build the OoB rejection results from the worst-case operational and OoB gains."""
+        # Rejections and pass flags of every OoB requirement in one vectorized step
+        required = np.array([req.rejection_db for req in oob_requirements], dtype=np.float64)
+        rejections = worst_case_operational - np.asarray(worst_case_oobs, dtype=np.float64)
+        passes = rejections > required
+        
+        oob_results = []
+        for oob_requirement, worst_case_oob, rejection, passed in zip(
+                oob_requirements, np.asarray(worst_case_oobs).tolist(), rejections.tolist(), passes.tolist()):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("OoB calculation: operational range %.3f to %.3f GHz, OoB range %.3f to %.3f GHz, "
+                             "worst-case operational gain %.2f dB, worst-case OoB gain %.2f dB, "
+                             "rejection %.2f dB (required %.2f dB), pass: %s",
+                             operational_min, operational_max, oob_requirement.freq_min, oob_requirement.freq_max,
+                             worst_case_operational, worst_case_oob, rejection, oob_requirement.rejection_db, passed)
+            
+            oob_results.append({
+                'rejection_db': rejection,
+                'worst_case_operational': worst_case_operational,
+                'worst_case_oob': worst_case_oob,
+                'requirement': oob_requirement.rejection_db,
+                'pass': passed
+            })
+        
+        return oob_results
     
     def process_s_parameters(self, s_param_data: SParameterData, 
                            dut_config: DUTConfiguration,
                            test_stage: str) -> Dict[str, Dict[str, any]]:
         """Process S-parameter data and calculate all requirements."""
         # Get requirements for the test stage
-        if test_stage == TEST_STAGES["board_bringup"]:
-            requirements = dut_config.board_bringup
-        elif test_stage == TEST_STAGES["sit"]:
-            requirements = dut_config.sit
-        elif test_stage == TEST_STAGES["test_campaign"]:
-            requirements = dut_config.test_campaign
-        else:
+        requirements = dut_config.get_requirements(test_stage)
+        if requirements is None:
             raise ValueError(f"Unknown test stage: {test_stage}")
         
+        # Results only depend on the data, the DUT configuration and the stage; data and configurations
+        # are replaced, not mutated, when reloaded/edited. The cached objects are kept so their ids can't be reused.
+        cache_key = (id(s_param_data), id(dut_config), test_stage)
+        cached = self._results_cache.get(cache_key)
+        if cached is not None and cached[0] is s_param_data and cached[1] is dut_config:
+            self._results_cache.move_to_end(cache_key)
+            return self._copy_results(cached[2])
+        
         results = {}
         
+        # Reflection (Sxx) parameter names of every port - matched by name, so multi-digit
+        # port numbers can't be mistaken for one
+        ports = set(range(1, dut_config.num_ports + 1)) | set(dut_config.input_ports) | set(dut_config.output_ports)
+        reflection_params = {f"S{port}{port}" for port in ports}
+        
         # Determine which S-parameters to analyze based on port configuration
         s_params_to_analyze = []
-        print(f"DEBUG: Available S-parameters in file: {list(s_param_data.s_parameters.keys())}")
+        logger.debug("Available S-parameters in file: %s", list(s_param_data.s_parameters.keys()))
         
         # Add transmission S-parameters (output ports from input ports)
         for output_port in dut_config.output_ports:
@@ -136,69 +249,79 @@ class SParameterProcessor:
             if reflection_param in s_param_data.s_parameters and reflection_param not in s_params_to_analyze:
                 s_params_to_analyze.append(reflection_param)
         
-        print(f"DEBUG: S-parameters to analyze: {s_params_to_analyze}")
+        logger.debug("S-parameters to analyze: %s", s_params_to_analyze)
+        
+        # Gain of every transmission parameter and VSWR of every reflection parameter, each
+        # computed in one pass over the matching rows of the S-parameter matrix
+        reflection_names = [name for name in s_params_to_analyze if name in reflection_params]
+        transmission_names = [name for name in s_params_to_analyze if name not in reflection_params]
+        transmission_rows = [s_param_data.index[name] for name in transmission_names]
+        gains = dict(zip(transmission_names, self._gain_from_parts(
+            s_param_data.real[transmission_rows], s_param_data.imag[transmission_rows])))
+        reflection_rows = [s_param_data.index[name] for name in reflection_names]
+        vswrs = dict(zip(reflection_names, self._vswr_from_magnitude(
+            np.hypot(s_param_data.real[reflection_rows], s_param_data.imag[reflection_rows]))))
+        
+        # Operational and OoB band indices are the same for every S-parameter of the file
+        operational_min = dut_config.operational_range.min_freq
+        operational_max = dut_config.operational_range.max_freq
+        oob_requirements = requirements.out_of_band_requirements
+        op_band = self.find_frequency_range_indices(s_param_data.frequency, operational_min, operational_max)
+        oob_bounds = self._oob_bounds(s_param_data.frequency, oob_requirements)
         
         for s_param_name in s_params_to_analyze:
             s_param = s_param_data.s_parameters[s_param_name]
             
             # Determine if this is a transmission or reflection parameter
-            is_reflection = s_param_name.startswith('S') and s_param_name[1] == s_param_name[2]  # S11, S22, etc.
+            is_reflection = s_param_name in reflection_params  # S11, S22, etc.
             is_transmission = not is_reflection  # S21, S31, S41, etc.
             
-            print(f"DEBUG: Processing {s_param_name} - Type: {'Reflection' if is_reflection else 'Transmission'}")
+            logger.debug("Processing %s - Type: %s", s_param_name, 'Reflection' if is_reflection else 'Transmission')
             
             # Initialize results with default values
             in_band_stats = {'min_gain': 0.0, 'max_gain': 0.0, 'flatness': 0.0}
+            vswr = np.empty(0)
             vswr_max = 0.0
             oob_results = []
             
             if is_transmission:
                 # For transmission parameters (Sxy where x≠y), calculate gain-related metrics
-                gain = self.calculate_gain(s_param)
+                logger.debug("Processing %s OoB requirements for transmission parameter", len(oob_requirements))
+                gain = gains[s_param_name]
                 
                 # Calculate in-band gain
-                in_band_stats = self.calculate_in_band_gain(
-                    s_param_data.frequency, gain,
-                    dut_config.operational_range.min_freq,
-                    dut_config.operational_range.max_freq
-                )
+                in_band_stats = self._in_band_gain_stats(gain, op_band)
                 
-                # Calculate out-of-band rejections
-                print(f"DEBUG: Processing {len(requirements.out_of_band_requirements)} OoB requirements for transmission parameter")
-                for i, oob_req in enumerate(requirements.out_of_band_requirements):
-                    oob_result = self.calculate_out_of_band_rejection(
-                        s_param_data.frequency, gain, oob_req,
-                        dut_config.operational_range.min_freq,
-                        dut_config.operational_range.max_freq
-                    )
-                    oob_results.append(oob_result)
-                    print(f"DEBUG: OoB {i+1} result: {oob_result}")
+                # Calculate out-of-band rejections (the worst-case operational gain is the in-band minimum)
+                oob_results = self._oob_results(
+                    oob_requirements, in_band_stats['min_gain'], self._oob_worst_cases(gain, oob_bounds),
+                    operational_min, operational_max
+                )
+                for i, oob_result in enumerate(oob_results):
+                    logger.debug("OoB %s result: %s", i + 1, oob_result)
                 
-                print(f"DEBUG: Skipping VSWR for {s_param_name} (transmission parameter)")
+                logger.debug("Skipping VSWR for %s (transmission parameter)", s_param_name)
                 
             elif is_reflection:
                 # For reflection parameters (Sxx), calculate VSWR
-                s11 = s_param_data.s_parameters[s_param_name]
-                vswr = self.calculate_vswr(s11)
-                vswr_max = self.calculate_vswr_max(
-                    s_param_data.frequency, vswr,
-                    dut_config.operational_range.min_freq,
-                    dut_config.operational_range.max_freq
-                )
-                print(f"DEBUG: VSWR calculated for {s_param_name}: {vswr_max}")
+                vswr = vswrs[s_param_name]
+                vswr_max = self._vswr_max_in_band(vswr, op_band, capped=True)
+                logger.debug("VSWR calculated for %s: %s", s_param_name, vswr_max)
                 
-                print(f"DEBUG: Skipping gain/OoB calculations for {s_param_name} (reflection parameter)")
+                logger.debug("Skipping gain/OoB calculations for %s (reflection parameter)", s_param_name)
             
             # Determine pass/fail based on parameter type
             if is_transmission:
-                pass_fail = self._determine_transmission_pass_fail(in_band_stats, oob_results, requirements)
+                oob_pass_mask = np.array([oob_result['pass'] for oob_result in oob_results], dtype=bool)
+                pass_fail = self._determine_transmission_pass_fail(in_band_stats, oob_pass_mask, requirements)
             else:  # is_reflection
                 pass_fail = self._determine_reflection_pass_fail(vswr_max, requirements)
             
             # Prepare results based on parameter type
             result_data = {
                 'frequency': s_param_data.frequency,
-                's11_data': s_param if is_reflection else [],
+                's11_data': s_param if is_reflection else np.empty(0, dtype=np.complex128),
+                'vswr': vswr,  # Full-sweep VSWR (reflection parameters), reused by the VSWR plots
                 'vswr_max': vswr_max,
                 'pass_fail': pass_fail,
                 'parameter_type': 'reflection' if is_reflection else 'transmission'
@@ -216,7 +339,7 @@ class SParameterProcessor:
             else:
                 # Add empty gain-related data for reflection parameters
                 result_data.update({
-                    'gain': [],
+                    'gain': np.empty(0),
                     'in_band_gain_min': 0.0,
                     'in_band_gain_max': 0.0,
                     'flatness': 0.0,
@@ -225,10 +348,27 @@ class SParameterProcessor:
             
             results[s_param_name] = result_data
         
-        return results
+        self._results_cache[cache_key] = (s_param_data, dut_config, results)
+        if len(self._results_cache) > _RESULTS_CACHE_SIZE:
+            self._results_cache.popitem(last=False)
+        
+        return self._copy_results(results)
+    
+    def _copy_results(self, results: Dict[str, Dict[str, any]]) -> Dict[str, Dict[str, any]]:
+        """Copy the result dicts so callers adding or replacing entries can't change the cached results."""
+        return {s_param_name: {**result_data,
+                               'out_of_band_rejections': [dict(oob) for oob in result_data['out_of_band_rejections']]}
+                for s_param_name, result_data in results.items()}
+    
+    def _result_vswr(self, result_data: Dict[str, any]) -> np.ndarray:
+        """Get the full-sweep VSWR computed by process_s_parameters (calculated here for results without it)."""
+        vswr = result_data.get('vswr')
+        if vswr is None or len(vswr) != len(result_data['s11_data']):
+            vswr = self.calculate_vswr(result_data['s11_data'])
+        return vswr
     
     def _determine_transmission_pass_fail(self, in_band_stats: Dict[str, float], 
-                                        oob_results: List[Dict[str, float]], 
+                                        oob_pass_mask: np.ndarray, 
                                         requirements: TestStageRequirements) -> str:
         """Determine pass/fail status for transmission S-parameters (Sxy where x≠y)."""
         # Check gain requirements
@@ -240,10 +380,9 @@ class SParameterProcessor:
         if in_band_stats['flatness'] > requirements.gain_flatness_db:
             return "Fail"
         
-        # Check out-of-band requirements
-        for oob_result in oob_results:
-            if not oob_result['pass']:
-                return "Fail"
+        # Check out-of-band requirements (one pass flag per OoB requirement)
+        if not oob_pass_mask.all():
+            return "Fail"
         
         return "Pass"
     
@@ -265,30 +404,84 @@ class SParameterProcessor:
         if not results:
             return plot_data
         
-        # Get requirements for the test stage
-        if test_stage == TEST_STAGES["board_bringup"]:
-            requirements = dut_config.board_bringup
-        elif test_stage == TEST_STAGES["sit"]:
-            requirements = dut_config.sit
-        elif test_stage == TEST_STAGES["test_campaign"]:
-            requirements = dut_config.test_campaign
-        else:
-            requirements = dut_config.board_bringup
+        # Get requirements for the test stage (unknown stages fall back to board bring-up)
+        requirements = dut_config.get_requirements(test_stage) or dut_config.board_bringup
+        
+        # Plot layout (everything but the curves) - the same for every S-parameter of this plot type
+        if plot_type == "wideband_gain":
+            plot_template = {
+                'title': f"{dut_config.name} Wideband Gain",
+                'x_label': "Frequency (GHz)",
+                'y_label': "Gain (dB)",
+                'default_x_min': dut_config.wideband_range.min_freq,
+                'default_x_max': dut_config.wideband_range.max_freq
+            }
+        elif plot_type == "operational_gain":
+            # Set reasonable gain range (just above acceptance criteria)
+            gain_range = requirements.gain_max_db - requirements.gain_min_db
+            gain_margin = max(gain_range * 0.2, 2.0)  # 20% margin or 2dB minimum
+            
+            plot_template = {
+                'title': f"{dut_config.name} Operational Gain",
+                'x_label': "Frequency (GHz)",
+                'y_label': "Gain (dB)",
+                'acceptance_region': {
+                    'freq_min': dut_config.operational_range.min_freq,
+                    'freq_max': dut_config.operational_range.max_freq,
+                    'gain_min': requirements.gain_min_db,
+                    'gain_max': requirements.gain_max_db,
+                    'y_min': requirements.gain_min_db - gain_margin,
+                    'y_max': requirements.gain_max_db + gain_margin
+                }
+            }
+        elif plot_type == "wideband_vswr":
+            plot_template = {
+                'title': f"{dut_config.name} Wideband VSWR",
+                'x_label': "Frequency (GHz)",
+                'y_label': "VSWR",
+                'default_x_min': dut_config.wideband_range.min_freq,
+                'default_x_max': dut_config.wideband_range.max_freq,
+                'default_y_min': 1.0,
+                'default_y_max': 2.0
+            }
+        elif plot_type == "operational_vswr":
+            plot_template = {
+                'title': f"{dut_config.name} Operational VSWR",
+                'x_label': "Frequency (GHz)",
+                'y_label': "VSWR",
+                'acceptance_region': {
+                    'freq_min': dut_config.operational_range.min_freq,
+                    'freq_max': dut_config.operational_range.max_freq,
+                    'vswr_min': 1.0,  # VSWR cannot be less than 1
+                    'vswr_max': requirements.vswr_max,
+                    'y_min': 1.0,     # Y-axis minimum
+                    'y_max': 2.0      # Y-axis maximum
+                }
+            }
         
-        # Define colors for different S-parameters
-        colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
+        # Wideband/operational masks, computed once per frequency sweep (shared by every
+        # S-parameter of a file); the sweep is kept with its mask so its id can't be reused
+        range_masks = {}
         
-        # Define line styles for PRI/RED distinction
-        line_styles = {'PRI': '-', 'RED': '--'}
+        def range_mask(freq_array, freq_range):
+            """Get the mask of the sweep points inside a frequency range."""
+            key = (id(freq_array), freq_range.min_freq, freq_range.max_freq)
+            cached = range_masks.get(key)
+            if cached is not None and cached[0] is freq_array:
+                return cached[1]
+            mask = (freq_array >= freq_range.min_freq) & (freq_array <= freq_range.max_freq)
+            range_masks[key] = (freq_array, mask)
+            return mask
         
         # Process all files (PRI, RED, etc.)
         for file_key, file_results in results.items():
             if not isinstance(file_results, dict):
                 continue
-                
+            
+            linestyle = _LINE_STYLES.get(file_key, '-')  # Default to solid line
+            
             for i, (s_param_name, result_data) in enumerate(file_results.items()):
-                color = colors[i % len(colors)]
-                linestyle = line_styles.get(file_key, '-')  # Default to solid line
+                color = _PLOT_COLORS[i % len(_PLOT_COLORS)]
                 
                 # Create unique key for each S-parameter and file combination
                 plot_key = f"{s_param_name}_{file_key}"
@@ -296,32 +489,24 @@ class SParameterProcessor:
                 if plot_type == "wideband_gain":
                     # Only process transmission parameters (Sxy where x != y)
                     if result_data.get('parameter_type') != 'transmission':
-                        print(f"DEBUG: Skipping {s_param_name} for wideband gain - not a transmission parameter")
+                        logger.debug("Skipping %s for wideband gain - not a transmission parameter", s_param_name)
                         continue
                     
                     if s_param_name not in plot_data:
-                        plot_data[s_param_name] = {
-                            'title': f"{dut_config.name} Wideband Gain",
-                            'x_label': "Frequency (GHz)",
-                            'y_label': "Gain (dB)",
-                            'curves': [],
-                            'default_x_min': dut_config.wideband_range.min_freq,
-                            'default_x_max': dut_config.wideband_range.max_freq
-                        }
+                        plot_data[s_param_name] = {**plot_template, 'curves': []}
                     
                     # Filter to wideband frequency range only
-                    freq_array = np.array(result_data['frequency'])
-                    gain_array = np.array(result_data['gain'])
+                    freq_array = np.asarray(result_data['frequency'])
+                    gain_array = np.asarray(result_data['gain'])
                     
                     # Ensure arrays have the same length
                     if len(freq_array) != len(gain_array):
-                        print(f"DEBUG: Skipping {s_param_name} - frequency and gain arrays have different lengths")
+                        logger.debug("Skipping %s - frequency and gain arrays have different lengths", s_param_name)
                         continue
                     
-                    freq_mask = ((freq_array >= dut_config.wideband_range.min_freq) & 
-                               (freq_array <= dut_config.wideband_range.max_freq))
-                    wideband_freq = freq_array[freq_mask].tolist()
-                    wideband_gain = gain_array[freq_mask].tolist()
+                    freq_mask = range_mask(freq_array, dut_config.wideband_range)
+                    wideband_freq = freq_array[freq_mask]
+                    wideband_gain = gain_array[freq_mask]
                     
                     plot_data[s_param_name]['curves'].append({
                         'x': wideband_freq,
@@ -332,28 +517,11 @@ class SParameterProcessor:
                     })
                 elif plot_type == "operational_gain":
                         if s_param_name not in plot_data:
-                            # Set reasonable gain range (just above acceptance criteria)
-                            gain_range = requirements.gain_max_db - requirements.gain_min_db
-                            gain_margin = max(gain_range * 0.2, 2.0)  # 20% margin or 2dB minimum
-                            
-                            plot_data[s_param_name] = {
-                                'title': f"{dut_config.name} Operational Gain",
-                                'x_label': "Frequency (GHz)",
-                                'y_label': "Gain (dB)",
-                                'curves': [],
-                                'acceptance_region': {
-                                    'freq_min': dut_config.operational_range.min_freq,
-                                    'freq_max': dut_config.operational_range.max_freq,
-                                    'gain_min': requirements.gain_min_db,
-                                    'gain_max': requirements.gain_max_db,
-                                    'y_min': requirements.gain_min_db - gain_margin,
-                                    'y_max': requirements.gain_max_db + gain_margin
-                                }
-                            }
+                            plot_data[s_param_name] = {**plot_template, 'curves': []}
                         
                         plot_data[s_param_name]['curves'].append({
-                            'x': result_data['frequency'],
-                            'y': result_data['gain'],
+                            'x': np.asarray(result_data['frequency']),
+                            'y': np.asarray(result_data['gain']),
                             'label': f'{s_param_name} {file_key}',
                             'linestyle': linestyle,
                             'color': color
@@ -361,42 +529,32 @@ class SParameterProcessor:
                 elif plot_type == "wideband_vswr":
                     # Only process reflection parameters (Sxx where x = y)
                     if result_data.get('parameter_type') != 'reflection':
-                        print(f"DEBUG VSWR: Skipping {s_param_name} for wideband VSWR - not a reflection parameter")
+                        logger.debug("Skipping %s for wideband VSWR - not a reflection parameter", s_param_name)
                         continue
                     
-                    print(f"DEBUG VSWR: Processing {s_param_name}, vswr_max = {result_data['vswr_max']}")
+                    logger.debug("Processing %s, vswr_max = %s", s_param_name, result_data['vswr_max'])
                     if result_data['vswr_max'] > 0:  # Only for reflection S-parameters
                         # Calculate VSWR for all frequencies
-                        vswr_values = self.calculate_vswr(result_data['s11_data'])
-                        print(f"DEBUG VSWR: Calculated {len(vswr_values)} VSWR values")
+                        vswr_array = np.asarray(self._result_vswr(result_data))
+                        logger.debug("Calculated %s VSWR values", len(vswr_array))
                         
                         # Filter to wideband frequency range only
-                        freq_array = np.array(result_data['frequency'])
-                        vswr_array = np.array(vswr_values)
+                        freq_array = np.asarray(result_data['frequency'])
                         
                         # Ensure arrays have the same length
                         if len(freq_array) != len(vswr_array):
-                            print(f"DEBUG VSWR: Skipping {s_param_name} - frequency and VSWR arrays have different lengths")
+                            logger.debug("Skipping %s - frequency and VSWR arrays have different lengths", s_param_name)
                             continue
                         
-                        freq_mask = ((freq_array >= dut_config.wideband_range.min_freq) & 
-                                   (freq_array <= dut_config.wideband_range.max_freq))
-                        wideband_freq = freq_array[freq_mask].tolist()
-                        wideband_vswr = vswr_array[freq_mask].tolist()
-                        print(f"DEBUG VSWR: Wideband range: {dut_config.wideband_range.min_freq} to {dut_config.wideband_range.max_freq} GHz")
-                        print(f"DEBUG VSWR: Filtered to {len(wideband_freq)} points in wideband range")
+                        freq_mask = range_mask(freq_array, dut_config.wideband_range)
+                        wideband_freq = freq_array[freq_mask]
+                        wideband_vswr = vswr_array[freq_mask]
+                        logger.debug("Wideband range: %s to %s GHz",
+                                     dut_config.wideband_range.min_freq, dut_config.wideband_range.max_freq)
+                        logger.debug("Filtered to %s points in wideband range", len(wideband_freq))
                         
                         if s_param_name not in plot_data:
-                            plot_data[s_param_name] = {
-                                'title': f"{dut_config.name} Wideband VSWR",
-                                'x_label': "Frequency (GHz)",
-                                'y_label': "VSWR",
-                                'curves': [],
-                                'default_x_min': dut_config.wideband_range.min_freq,
-                                'default_x_max': dut_config.wideband_range.max_freq,
-                                'default_y_min': 1.0,
-                                'default_y_max': 2.0
-                            }
+                            plot_data[s_param_name] = {**plot_template, 'curves': []}
                         
                         plot_data[s_param_name]['curves'].append({
                             'x': wideband_freq,
@@ -405,57 +563,43 @@ class SParameterProcessor:
                             'linestyle': linestyle,
                             'color': color
                         })
-                        print(f"DEBUG VSWR: Added curve for {s_param_name} {file_key}")
+                        logger.debug("Added curve for %s %s", s_param_name, file_key)
                     else:
-                        print(f"DEBUG VSWR: Skipping {s_param_name} (vswr_max = 0)")
+                        logger.debug("Skipping %s (vswr_max = 0)", s_param_name)
                 elif plot_type == "operational_vswr":
-                    print(f"DEBUG VSWR: Processing {s_param_name}, vswr_max = {result_data['vswr_max']}")
+                    logger.debug("Processing %s, vswr_max = %s", s_param_name, result_data['vswr_max'])
                     if result_data['vswr_max'] > 0:  # Only for reflection S-parameters
                         # Calculate VSWR for all frequencies
-                        vswr_values = self.calculate_vswr(result_data['s11_data'])
-                        print(f"DEBUG VSWR: Calculated {len(vswr_values)} VSWR values")
+                        vswr_values = np.asarray(self._result_vswr(result_data))
+                        logger.debug("Calculated %s VSWR values", len(vswr_values))
                         
                         # Validate VSWR data
-                        if not vswr_values or len(vswr_values) == 0:
-                            print(f"DEBUG VSWR: Skipping {s_param_name} - no VSWR data")
+                        if len(vswr_values) == 0:
+                            logger.debug("Skipping %s - no VSWR data", s_param_name)
                             continue
                         
                         # Check for invalid values
-                        valid_vswr = [v for v in vswr_values if np.isfinite(v) and v > 0]
-                        if len(valid_vswr) == 0:
-                            print(f"DEBUG VSWR: Skipping {s_param_name} - no valid VSWR values")
+                        if not (np.isfinite(vswr_values) & (vswr_values > 0)).any():
+                            logger.debug("Skipping %s - no valid VSWR values", s_param_name)
                             continue
                         
                         # Filter to operational frequency range only
-                        freq_array = np.array(result_data['frequency'])
-                        freq_mask = ((freq_array >= dut_config.operational_range.min_freq) & 
-                                   (freq_array <= dut_config.operational_range.max_freq))
-                        operational_freq = freq_array[freq_mask].tolist()
-                        operational_vswr = np.array(vswr_values)[freq_mask].tolist()
+                        freq_array = np.asarray(result_data['frequency'])
+                        freq_mask = range_mask(freq_array, dut_config.operational_range)
+                        operational_freq = freq_array[freq_mask]
+                        operational_vswr = vswr_values[freq_mask]
                         
-                        print(f"DEBUG VSWR: Operational range: {dut_config.operational_range.min_freq:.3f} to {dut_config.operational_range.max_freq:.3f} GHz")
-                        print(f"DEBUG VSWR: Filtered to {len(operational_freq)} points in operational range")
+                        logger.debug("Operational range: %.3f to %.3f GHz",
+                                     dut_config.operational_range.min_freq, dut_config.operational_range.max_freq)
+                        logger.debug("Filtered to %s points in operational range", len(operational_freq))
                         
                         # Skip if no data in operational range
                         if len(operational_freq) == 0:
-                            print(f"DEBUG VSWR: Skipping {s_param_name} - no data in operational range")
+                            logger.debug("Skipping %s - no data in operational range", s_param_name)
                             continue
                         
                         if s_param_name not in plot_data:
-                            plot_data[s_param_name] = {
-                                'title': f"{dut_config.name} Operational VSWR",
-                                'x_label': "Frequency (GHz)",
-                                'y_label': "VSWR",
-                                'curves': [],
-                                'acceptance_region': {
-                                    'freq_min': dut_config.operational_range.min_freq,
-                                    'freq_max': dut_config.operational_range.max_freq,
-                                    'vswr_min': 1.0,  # VSWR cannot be less than 1
-                                    'vswr_max': requirements.vswr_max,
-                                    'y_min': 1.0,     # Y-axis minimum
-                                    'y_max': 2.0      # Y-axis maximum
-                                }
-                            }
+                            plot_data[s_param_name] = {**plot_template, 'curves': []}
                         
                         # Final validation before adding to plot
                         if len(operational_freq) > 0 and len(operational_vswr) > 0:
@@ -466,15 +610,15 @@ class SParameterProcessor:
                                 'linestyle': linestyle,
                                 'color': color
                             })
-                            print(f"DEBUG VSWR: Added curve for {s_param_name} {file_key}")
+                            logger.debug("Added curve for %s %s", s_param_name, file_key)
                         else:
-                            print(f"DEBUG VSWR: Skipping {s_param_name} {file_key} - no valid operational data")
+                            logger.debug("Skipping %s %s - no valid operational data", s_param_name, file_key)
                     else:
-                        print(f"DEBUG VSWR: Skipping {s_param_name} (vswr_max = 0)")
+                        logger.debug("Skipping %s (vswr_max = 0)", s_param_name)
         
         # Check if we have any data to plot
         if not plot_data:
-            print("DEBUG VSWR: No VSWR data to plot - all S-parameters skipped")
+            logger.debug("No VSWR data to plot - all S-parameters skipped")
             return {}
         
         return plot_data
@@ -6,12 +6,35 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 import json
 import os
+from src.constants import TEST_STAGES
+
+try:
+    import orjson  # Optional - faster parsing of the configuration file
+except ImportError:
+    orjson = None
+
+def _parse_json(raw: bytes) -> Any:
+    """Parse JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity literals, which only the stdlib parser accepts
+    return json.loads(raw)
+
+# Test stage -> DUTConfiguration attribute holding its requirements
+_STAGE_ATTRIBUTES = {stage: attribute for attribute, stage in TEST_STAGES.items()}
 
 @dataclass
 class FrequencyRange:
     """Frequency range specification."""
     min_freq: float  # GHz
     max_freq: float  # GHz
+    
+    def __post_init__(self):
+        # Range lookups rely on min_freq <= max_freq - reject reversed bounds instead of guessing
+        if self.min_freq > self.max_freq:
+            raise ValueError(f"Frequency range must be ordered: {self.min_freq} > {self.max_freq}")
 
 @dataclass
 class OutOfBandRequirement:
@@ -19,6 +42,11 @@ class OutOfBandRequirement:
     freq_min: float  # GHz
     freq_max: float  # GHz
     rejection_db: float  # dBc
+    
+    def __post_init__(self):
+        # Range lookups rely on freq_min <= freq_max - reject reversed bounds instead of guessing
+        if self.freq_min > self.freq_max:
+            raise ValueError(f"OoB frequency range must be ordered: {self.freq_min} > {self.freq_max}")
 
 @dataclass
 class PinPoutIM3Requirement:
@@ -74,6 +102,11 @@ class DUTConfiguration:
     board_bringup: TestStageRequirements = field(default_factory=TestStageRequirements)
     sit: TestStageRequirements = field(default_factory=TestStageRequirements)
     test_campaign: TestStageRequirements = field(default_factory=TestStageRequirements)
+    
+    def get_requirements(self, test_stage: str) -> Optional[TestStageRequirements]:
+        """Get the requirements for a test stage (None for an unknown stage)."""
+        attribute = _STAGE_ATTRIBUTES.get(test_stage)
+        return getattr(self, attribute) if attribute is not None else None
 
 class DUTConfigManager:
     """Manager for DUT configurations."""
@@ -90,8 +123,8 @@ class DUTConfigManager:
             return
         
         try:
-            with open(self.config_file, 'r') as f:
-                data = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                data = _parse_json(f.read())
             
             self.dut_configs = {}
             for name, config_data in data.items():
@@ -2,16 +2,46 @@
 Test data models for Macallan RF Performance Tool
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, FrozenInstanceError
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 import sqlite3
 import json
 import os
+import numpy as np
 
-@dataclass
+def _add_slots(cls):
+    """Recreate a frozen dataclass with __slots__ (dataclass(slots=True) needs Python 3.10)."""
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = field_names
+    # Class-level defaults would clash with the slot descriptors (__init__ already holds them)
+    for name in field_names + ('__dict__', '__weakref__'):
+        cls_dict.pop(name, None)
+    
+    # The generated frozen __setattr__/__delattr__ check against the original class - reject every assignment instead
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+    
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+    
+    # Frozen instances can't be restored with setattr, so pickle/copy go through object.__setattr__
+    def __getstate__(self):
+        return [getattr(self, name) for name in field_names]
+    
+    def __setstate__(self, state):
+        for name, value in zip(field_names, state):
+            object.__setattr__(self, name, value)
+    
+    cls_dict.update(__setattr__=__setattr__, __delattr__=__delattr__,
+                    __getstate__=__getstate__, __setstate__=__setstate__)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+@_add_slots
+@dataclass(frozen=True)
 class FileMetadata:
-    """Metadata extracted from filename."""
+    """Metadata extracted from filename (immutable, hashable and slotted, usable as a dict key)."""
     date_code: str  # YYYYMMDD
     serial_number: str  # SNXXXX
     part_number: str  # LXXXXXX
@@ -21,31 +51,101 @@ class FileMetadata:
 @dataclass
 class SParameterData:
     """S-parameter measurement data."""
-    frequency: List[float]  # GHz
-    s_parameters: Dict[str, List[complex]]  # S11, S21, etc.
+    frequency: np.ndarray  # GHz
+    s_parameters: Dict[str, np.ndarray]  # S11, S21, etc. (complex128 rows of matrix)
     format: str  # mag/deg, dB/deg, real/imag
+    matrix: np.ndarray = field(default=None, init=False, repr=False, compare=False)  # n_params x N complex128 block
+    index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)  # Name -> matrix row
+    real: np.ndarray = field(default=None, init=False, repr=False, compare=False)  # Contiguous float64 copy of matrix.real
+    imag: np.ndarray = field(default=None, init=False, repr=False, compare=False)  # Contiguous float64 copy of matrix.imag
+    
+    def __post_init__(self):
+        # Frequency as one contiguous array; all parameters packed into one contiguous complex128
+        # block, converted once at load - s_parameters values are row views into it
+        self.frequency = np.ascontiguousarray(self.frequency, dtype=np.float64)
+        names = list(self.s_parameters)
+        if names:
+            self.matrix = np.ascontiguousarray(np.stack(
+                [np.asarray(self.s_parameters[name], dtype=np.complex128) for name in names]))
+        else:
+            self.matrix = np.empty((0, len(self.frequency)), dtype=np.complex128)
+        self.index = {name: row for row, name in enumerate(names)}
+        self.s_parameters = {name: self.matrix[row] for name, row in self.index.items()}
+        # Split (non-interleaved) real/imaginary parts for the magnitude calculations
+        self.real = np.ascontiguousarray(self.matrix.real)
+        self.imag = np.ascontiguousarray(self.matrix.imag)
+
+# PowerLinearityData.test_type codes
+TEST_TYPE_SINGLE_TONE = 0
+TEST_TYPE_TWO_TONE = 1
 
 @dataclass
 class PowerLinearityData:
     """Power and linearity measurement data."""
-    frequency: List[float]  # GHz
-    pin: List[float]  # dBm
-    pout_single_tone: List[float]  # dBm
-    im3: List[float]  # dBc
-    im5: List[float]  # dBc
-    test_type: List[str]  # "single-tone" or "two-tone"
-    single_tone_pin: List[float] = field(default_factory=list)  # dBm - only Single Tone
-    single_tone_pout: List[float] = field(default_factory=list)  # dBm - only Single Tone
-    two_tone_pin: List[float] = field(default_factory=list)  # dBm - only Two Tone
-    two_tone_im3: List[float] = field(default_factory=list)  # dBc - only Two Tone
-    two_tone_im5: List[float] = field(default_factory=list)  # dBc - only Two Tone
-    freq_data: Dict = field(default_factory=dict)  # Frequency-specific data
+    frequency: np.ndarray  # GHz
+    pin: np.ndarray  # dBm
+    pout_single_tone: np.ndarray  # dBm
+    im3: np.ndarray  # dBc
+    im5: np.ndarray  # dBc
+    test_type: np.ndarray  # TEST_TYPE_SINGLE_TONE or TEST_TYPE_TWO_TONE (int8)
+    single_tone_pin: np.ndarray = field(default_factory=lambda: np.empty(0))  # dBm - only Single Tone
+    single_tone_pout: np.ndarray = field(default_factory=lambda: np.empty(0))  # dBm - only Single Tone
+    two_tone_pin: np.ndarray = field(default_factory=lambda: np.empty(0))  # dBm - only Two Tone
+    two_tone_im3: np.ndarray = field(default_factory=lambda: np.empty(0))  # dBc - only Two Tone
+    two_tone_im5: np.ndarray = field(default_factory=lambda: np.empty(0))  # dBc - only Two Tone
+    freq_data: Dict = field(default_factory=dict)  # Frequency-specific data (float64 arrays per column)
+    
+    def __post_init__(self):
+        # Contiguous float64 columns (missing values as NaN) and int8 test type codes
+        for name in ('frequency', 'pin', 'pout_single_tone', 'im3', 'im5', 'single_tone_pin',
+                     'single_tone_pout', 'two_tone_pin', 'two_tone_im3', 'two_tone_im5'):
+            setattr(self, name, np.ascontiguousarray(getattr(self, name), dtype=np.float64))
+        test_type = np.asarray(self.test_type)
+        if test_type.dtype.kind in 'UO':
+            # Accept the "single-tone"/"two-tone" labels as well
+            two_tone = test_type == "two-tone"
+            known = two_tone | (test_type == "single-tone")
+            if not known.all():
+                raise ValueError(f"Unknown test type: {test_type[~known][0]!r}")
+            test_type = np.where(two_tone, TEST_TYPE_TWO_TONE, TEST_TYPE_SINGLE_TONE)
+        self.test_type = test_type.astype(np.int8)
+        # Per-frequency columns are converted here once as well, into new dicts so the caller's
+        # are left as they are (columns passed as the same object stay shared)
+        converted = {}
+        freq_data = {}
+        for freq, columns in self.freq_data.items():
+            freq_columns = {}
+            for key, values in columns.items():
+                if id(values) not in converted:
+                    converted[id(values)] = np.ascontiguousarray(values, dtype=np.float64)
+                freq_columns[key] = converted[id(values)]
+            freq_data[freq] = freq_columns
+        self.freq_data = freq_data
 
-@dataclass
+@dataclass(init=False)
 class NoiseFigureData:
     """Noise figure measurement data."""
-    frequency: List[float]  # GHz
-    nf: List[float]  # dB
+    _data: np.ndarray  # 2 x N contiguous float64 block: row 0 frequency (GHz), row 1 NF (dB)
+    
+    def __init__(self, frequency: np.ndarray, nf: np.ndarray):
+        # Pack both series into one contiguous float64 block, converted once at load
+        self._data = np.ascontiguousarray(np.stack([np.asarray(frequency, dtype=np.float64),
+                                                    np.asarray(nf, dtype=np.float64)]))
+    
+    @property
+    def frequency(self) -> np.ndarray:
+        """Frequency in GHz (read-only attribute, a row view into the block)."""
+        return self._data[0]
+    
+    @property
+    def nf(self) -> np.ndarray:
+        """Noise figure in dB (read-only attribute, a row view into the block)."""
+        return self._data[1]
+    
+    @property
+    def data(self) -> np.ndarray:
+        """The 2 x N frequency/NF block."""
+        return self._data
 
 @dataclass
 class TestResults:
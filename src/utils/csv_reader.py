@@ -3,10 +3,23 @@ File readers for power/linearity and noise figure data (CSV and Excel formats)
 """
 
 import csv
-import pandas as pd
+import logging
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from src.models.test_data import PowerLinearityData, NoiseFigureData
+import numpy as np
+from src.models.test_data import PowerLinearityData, NoiseFigureData, TEST_TYPE_SINGLE_TONE, TEST_TYPE_TWO_TONE
+
+logger = logging.getLogger(__name__)
+
+def _build_freq_slices(freq_arr: np.ndarray, single_tone_rows: np.ndarray, two_tone_rows: np.ndarray
+                       ) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+    """Get (frequency, single-tone row indices, two-tone row indices) per unique frequency."""
+    slices = []
+    for freq in np.unique(freq_arr[~np.isnan(freq_arr)]).tolist():  # Sorted to ensure consistent order
+        freq_rows = freq_arr == freq
+        slices.append((freq, np.flatnonzero(single_tone_rows & freq_rows),
+                       np.flatnonzero(two_tone_rows & freq_rows)))
+    return slices
 
 class CSVReader:
     """Reader for CSV and Excel files containing power/linearity and noise figure data."""
@@ -17,6 +30,8 @@ class CSVReader:
     def read_power_linearity_csv(self, file_path: str) -> Optional[PowerLinearityData]:
         """Read power/linearity CSV or Excel file."""
         try:
+            import pandas as pd  # Deferred - pandas is slow to import at startup
+            
             # Read file based on extension
             if file_path.lower().endswith(('.xlsx', '.xls')):
                 df = pd.read_excel(file_path)
@@ -24,134 +39,88 @@ class CSVReader:
                 df = pd.read_csv(file_path)
             
             # Simple approach: Column C = Frequency, Column F = Pin, Column H = Pout, Column G = Mode
-            # Get the basic data
-            frequency_mhz = df['Frequency'].tolist()  # Column C
-            pin = df['Power Level (dBm)'].tolist()  # Column F
-            pout = df['Power Meter (dBm)'].tolist()  # Column H
-            mode = df['Mode'].tolist()  # Column G
-            temperature = df['Thermister Calc (C)'].tolist()  # Column J
+            # Numeric columns become float64 arrays; "OFF" and other non-numeric (Excel string) values become NaN
+            def numeric_column(name):
+                """Convert a column to a float64 array, non-numeric values as NaN."""
+                return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64)
+            
+            freq_arr = numeric_column('Frequency')  # Column C (MHz)
+            pin_arr = numeric_column('Power Level (dBm)')  # Column F
+            pout_arr = numeric_column('Power Meter (dBm)')  # Column H
+            # Column G - mode labels mapped once to int8 test type codes (-1 for anything else)
+            mode_codes = df['Mode'].map({"Single Tone": TEST_TYPE_SINGLE_TONE, "Two Tone": TEST_TYPE_TWO_TONE}
+                                        ).fillna(-1).to_numpy(dtype=np.int8)
+            temperature = numeric_column('Thermister Calc (C)')  # Column J
             
             # Extract marker data (only for two-tone)
-            marker1 = df['Marker 1 (dBm)'].tolist()  # Column K
-            marker2 = df['Marker 2 (dBm)'].tolist()  # Column L
-            marker3 = df['Marker 3 (dBm)'].tolist()  # Column M (IM3 lower)
-            marker4 = df['Marker 4 (dBm)'].tolist()  # Column N (IM3 upper)
-            marker5 = df['Marker 5 (dBm)'].tolist()  # Column O (IM5 lower)
-            marker6 = df['Marker 6 (dBm)'].tolist()  # Column P (IM5 upper)
-            
-            # Convert numeric columns to float to handle Excel string data
-            def safe_float_convert(value):
-                """Safely convert value to float, handling 'OFF' and other non-numeric strings."""
-                if pd.isna(value):
-                    return None
-                if isinstance(value, (int, float)):
-                    return float(value)
-                if isinstance(value, str):
-                    # Handle common non-numeric values
-                    if value.upper() in ['OFF', 'N/A', 'NA', '', ' ']:
-                        return None
-                    try:
-                        return float(value)
-                    except ValueError:
-                        return None
-                return None
-            
-            # Convert frequency data (should already be numeric)
-            frequency_mhz = [float(f) for f in frequency_mhz if f is not None and not pd.isna(f)]
-            print(f"DEBUG: frequency_mhz after conversion: {frequency_mhz}")
-            
-            # Convert all data but keep alignment - don't filter out None values yet
-            pin = [safe_float_convert(p) for p in pin]
-            pout = [safe_float_convert(p) for p in pout]
-            temperature = [safe_float_convert(t) for t in temperature]
-            marker1 = [safe_float_convert(m) for m in marker1]
-            marker2 = [safe_float_convert(m) for m in marker2]
-            marker3 = [safe_float_convert(m) for m in marker3]
-            marker4 = [safe_float_convert(m) for m in marker4]
-            marker5 = [safe_float_convert(m) for m in marker5]
-            marker6 = [safe_float_convert(m) for m in marker6]
-            
-            # Convert frequency from MHz to GHz
-            frequency_ghz = [freq / 1000.0 for freq in frequency_mhz]
-            print(f"DEBUG: frequency_ghz after conversion: {frequency_ghz}")
-            
-            # Ensure all lists have the same length
-            min_length = min(len(pin), len(pout), len(mode), len(temperature), 
-                           len(marker1), len(marker2), len(marker3), len(marker4), len(marker5), len(marker6))
-            
-            # Truncate all lists to the same length
-            pin = pin[:min_length]
-            pout = pout[:min_length]
-            mode = mode[:min_length]
-            temperature = temperature[:min_length]
-            marker1 = marker1[:min_length]
-            marker2 = marker2[:min_length]
-            marker3 = marker3[:min_length]
-            marker4 = marker4[:min_length]
-            marker5 = marker5[:min_length]
-            marker6 = marker6[:min_length]
-            
+            marker1 = numeric_column('Marker 1 (dBm)')  # Column K
+            marker2 = numeric_column('Marker 2 (dBm)')  # Column L
+            marker3_arr = numeric_column('Marker 3 (dBm)')  # Column M (IM3 lower)
+            marker4_arr = numeric_column('Marker 4 (dBm)')  # Column N (IM3 upper)
+            marker5_arr = numeric_column('Marker 5 (dBm)')  # Column O (IM5 lower)
+            marker6_arr = numeric_column('Marker 6 (dBm)')  # Column P (IM5 upper)
+            
+            # Frequencies present in the file, converted from MHz to GHz
+            frequency_mhz = freq_arr[~np.isnan(freq_arr)]
+            logger.debug("frequency_mhz after conversion: %s", frequency_mhz)
+            frequency_ghz = frequency_mhz / 1000.0
+            logger.debug("frequency_ghz after conversion: %s", frequency_ghz)
+            
+            # Separate sidebands default to 0.0 when the marker is missing;
+            # combined (max) IM3/IM5 for backward compatibility need both markers
+            im3_lower = np.where(np.isnan(marker3_arr), 0.0, marker3_arr)
+            im3_upper = np.where(np.isnan(marker4_arr), 0.0, marker4_arr)
+            im5_lower = np.where(np.isnan(marker5_arr), 0.0, marker5_arr)
+            im5_upper = np.where(np.isnan(marker6_arr), 0.0, marker6_arr)
+            im3_combined = np.where(np.isnan(marker3_arr) | np.isnan(marker4_arr), 0.0,
+                                    np.maximum(marker3_arr, marker4_arr))
+            im5_combined = np.where(np.isnan(marker5_arr) | np.isnan(marker6_arr), 0.0,
+                                    np.maximum(marker5_arr, marker6_arr))
+            
+            # Row masks computed once per file; the per-frequency row indices only depend on
+            # the sweep layout, so they are memoized and reused when the same layout is loaded again
+            measured = ~np.isnan(pin_arr)  # Skip "OFF" values
+            single_tone_rows = measured & (mode_codes == TEST_TYPE_SINGLE_TONE)
+            two_tone_rows = measured & (mode_codes == TEST_TYPE_TWO_TONE)
+            freq_slices = _build_freq_slices(freq_arr, single_tone_rows, two_tone_rows)
             # Create 6 arrays: PRI-2200, PRI-2240, PRI-2280, RED-2200, RED-2240, RED-2280
-            # First, get unique frequencies
-            unique_frequencies = list(set(frequency_mhz))
-            unique_frequencies.sort()  # Sort to ensure consistent order
+            unique_frequencies = [freq for freq, _, _ in freq_slices]
             
-            # Create dictionaries to store data for each frequency
+            # Group rows by frequency - float64 arrays per column, shared by every consumer
             freq_data = {}
-            for freq in unique_frequencies:
+            for freq, single_tone, two_tone in freq_slices:
                 freq_data[freq] = {
-                    'single_tone_pin': [],
-                    'single_tone_pout': [],
-                    'two_tone_pin': [],
-                    'two_tone_im3_lower': [],
-                    'two_tone_im3_upper': [],
-                    'two_tone_im5_lower': [],
-                    'two_tone_im5_upper': [],
-                    'two_tone_im3': [],  # Combined for backward compatibility
-                    'two_tone_im5': []   # Combined for backward compatibility
+                    'single_tone_pin': pin_arr[single_tone],
+                    'single_tone_pout': pout_arr[single_tone],
+                    'two_tone_pin': pin_arr[two_tone],
+                    'two_tone_im3_lower': im3_lower[two_tone],
+                    'two_tone_im3_upper': im3_upper[two_tone],
+                    'two_tone_im5_lower': im5_lower[two_tone],
+                    'two_tone_im5_upper': im5_upper[two_tone],
+                    'two_tone_im3': im3_combined[two_tone],  # Combined for backward compatibility
+                    'two_tone_im5': im5_combined[two_tone]   # Combined for backward compatibility
                 }
             
-            # Process each row and group by frequency
-            for i in range(len(pin)):
-                if pin[i] is not None:  # Skip "OFF" values
-                    freq = frequency_mhz[i]
-                    if freq in freq_data:
-                        if mode[i] == "Single Tone":
-                            freq_data[freq]['single_tone_pin'].append(pin[i])
-                            freq_data[freq]['single_tone_pout'].append(pout[i])
-                        elif mode[i] == "Two Tone":
-                            freq_data[freq]['two_tone_pin'].append(pin[i])
-                            # Store separate upper and lower sidebands
-                            freq_data[freq]['two_tone_im3_lower'].append(marker3[i] if marker3[i] is not None else 0.0)
-                            freq_data[freq]['two_tone_im3_upper'].append(marker4[i] if marker4[i] is not None else 0.0)
-                            freq_data[freq]['two_tone_im5_lower'].append(marker5[i] if marker5[i] is not None else 0.0)
-                            freq_data[freq]['two_tone_im5_upper'].append(marker6[i] if marker6[i] is not None else 0.0)
-                            # Also store combined for backward compatibility
-                            freq_data[freq]['two_tone_im3'].append(max(marker3[i], marker4[i]) if marker3[i] is not None and marker4[i] is not None else 0.0)
-                            freq_data[freq]['two_tone_im5'].append(max(marker5[i], marker6[i]) if marker5[i] is not None and marker6[i] is not None else 0.0)
-            
-            # For backward compatibility, create combined lists
-            single_tone_pin = []
-            single_tone_pout = []
-            two_tone_pin = []
-            two_tone_im3 = []
-            two_tone_im5 = []
-            
-            for freq in unique_frequencies:
-                single_tone_pin.extend(freq_data[freq]['single_tone_pin'])
-                single_tone_pout.extend(freq_data[freq]['single_tone_pout'])
-                two_tone_pin.extend(freq_data[freq]['two_tone_pin'])
-                two_tone_im3.extend(freq_data[freq]['two_tone_im3'])
-                two_tone_im5.extend(freq_data[freq]['two_tone_im5'])
+            # For backward compatibility, create combined arrays
+            def combined(key):
+                """Concatenate one column across frequencies, in frequency order."""
+                return np.concatenate([freq_data[freq][key] for freq in unique_frequencies]) if freq_data else np.empty(0)
+            
+            single_tone_pin = combined('single_tone_pin')
+            single_tone_pout = combined('single_tone_pout')
+            two_tone_pin = combined('two_tone_pin')
+            two_tone_im3 = combined('two_tone_im3')
+            two_tone_im5 = combined('two_tone_im5')
             
             pout_single_tone = single_tone_pout.copy()
-            im3_data = [0.0] * len(single_tone_pin) + two_tone_im3  # No IM3 for single-tone
-            im5_data = [0.0] * len(single_tone_pin) + two_tone_im5  # No IM5 for single-tone
-            test_type = ["single-tone"] * len(single_tone_pin) + ["two-tone"] * len(two_tone_pin)
+            im3_data = np.concatenate([np.zeros(len(single_tone_pin)), two_tone_im3])  # No IM3 for single-tone
+            im5_data = np.concatenate([np.zeros(len(single_tone_pin)), two_tone_im5])  # No IM5 for single-tone
+            test_type = np.concatenate([np.full(len(single_tone_pin), TEST_TYPE_SINGLE_TONE, dtype=np.int8),
+                                        np.full(len(two_tone_pin), TEST_TYPE_TWO_TONE, dtype=np.int8)])
             
             return PowerLinearityData(
                 frequency=frequency_ghz,
-                pin=pin,
+                pin=pin_arr,
                 pout_single_tone=pout_single_tone,
                 im3=im3_data,
                 im5=im5_data,
@@ -171,6 +140,8 @@ class CSVReader:
     def read_noise_figure_csv(self, file_path: str) -> Optional[NoiseFigureData]:
         """Read noise figure CSV or Excel file."""
         try:
+            import pandas as pd
+            
             # Read file based on extension
             if file_path.lower().endswith(('.xlsx', '.xls')):
                 df = pd.read_excel(file_path)
@@ -179,19 +150,19 @@ class CSVReader:
             
             # Extract frequency and noise figure data
             # Note: This is a placeholder - we need the actual column structure
-            frequency = df['Frequency'].tolist()  # Assuming frequency column exists
-            nf = df['Noise Figure'].tolist()  # Assuming NF column exists
-            
-            # Convert numeric columns to float to handle Excel string data
-            try:
-                frequency = [float(f) for f in frequency if pd.notna(f)]
-                nf = [float(n) for n in nf if pd.notna(n)]
-            except (ValueError, TypeError) as e:
-                print(f"Warning: Could not convert some numeric data to float: {e}")
-                # Continue with original data - let the processor handle any remaining issues
+            # Convert numeric columns to float to handle Excel string data; non-numeric cells
+            # become NaN and their rows are skipped with missing ones, keeping frequency and NF aligned
+            raw = df[['Frequency', 'Noise Figure']]  # Assuming frequency and NF columns exist
+            numeric = raw.apply(pd.to_numeric, errors='coerce')
+            non_numeric = int((numeric.isna() & raw.notna()).any(axis=1).sum())
+            if non_numeric:
+                print(f"Warning: Skipping {non_numeric} row(s) with non-numeric data in {file_path}")
+            numeric = numeric.dropna()
+            frequency = numeric['Frequency'].to_numpy(dtype=np.float64)
+            nf = numeric['Noise Figure'].to_numpy(dtype=np.float64)
             
             # Convert frequency to GHz if needed
-            frequency_ghz = [freq / 1000.0 if freq > 100 else freq for freq in frequency]
+            frequency_ghz = np.where(frequency > 100, frequency / 1000.0, frequency)
             
             return NoiseFigureData(
                 frequency=frequency_ghz,
@@ -205,6 +176,8 @@ class CSVReader:
     def extract_csv_metadata(self, file_path: str) -> Dict[str, Any]:
         """Extract metadata from CSV or Excel file."""
         try:
+            import pandas as pd
+            
             # Read first few rows to get metadata
             if file_path.lower().endswith(('.xlsx', '.xls')):
                 df = pd.read_excel(file_path, nrows=1)
@@ -248,6 +221,8 @@ class CSVReader:
     def validate_csv_structure(self, file_path: str, file_type: str) -> Tuple[bool, str]:
         """Validate CSV or Excel file structure."""
         try:
+            import pandas as pd
+            
             # Read first 5 rows for validation
             if file_path.lower().endswith(('.xlsx', '.xls')):
                 df = pd.read_excel(file_path, nrows=5)
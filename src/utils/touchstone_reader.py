@@ -5,7 +5,6 @@ Touchstone file reader utilities using scikit-rf
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 from src.models.test_data import SParameterData
-import skrf as rf
 
 class TouchstoneReader:
     """Reader for Touchstone (.s1p, .s2p, .s3p, .s4p) files using scikit-rf."""
@@ -16,6 +15,8 @@ class TouchstoneReader:
     def read_touchstone_file(self, file_path: str) -> Optional[SParameterData]:
         """Read a Touchstone file and return S-parameter data."""
         try:
+            import skrf as rf  # Deferred - scikit-rf pulls in scipy and is slow to import at startup
+            
             # Use scikit-rf to read the Touchstone file
             network = rf.Network(file_path)
             
@@ -36,7 +37,7 @@ class TouchstoneReader:
             format_type = "mag/deg"  # Default, scikit-rf handles conversion internally
             
             return SParameterData(
-                frequency=frequencies.tolist(),
+                frequency=frequencies,
                 s_parameters=s_parameters,
                 format=format_type
             )
@@ -48,6 +49,8 @@ class TouchstoneReader:
     def validate_touchstone_file(self, file_path: str) -> Tuple[bool, str]:
         """Validate Touchstone file using scikit-rf."""
         try:
+            import skrf as rf
+            
             network = rf.Network(file_path)
             
             # Basic validation
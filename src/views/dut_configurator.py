@@ -595,34 +595,38 @@ class DUTConfiguratorDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "Invalid port numbers.")
             return
         
-        # Create DUT configuration
-        dut_config = DUTConfiguration(
-            name=self.name_edit.text().strip(),
-            part_number=self.part_number_edit.text().strip(),
-            operational_range=FrequencyRange(
-                min_freq=self.op_min_edit.value(),
-                max_freq=self.op_max_edit.value()
-            ),
-            wideband_range=FrequencyRange(
-                min_freq=self.wb_min_edit.value(),
-                max_freq=self.wb_max_edit.value()
-            ),
-            num_ports=self.num_ports_spin.value(),
-            input_ports=input_ports,
-            output_ports=output_ports,
-            hg_lg_enabled=self.hg_lg_checkbox.isChecked(),
-            test_enables={
-                's_parameters': self.s_param_checkbox.isChecked(),
-                'compression': self.compression_checkbox.isChecked(),
-                'linearity': self.linearity_checkbox.isChecked(),
-                'noise_figure': self.nf_checkbox.isChecked(),
-                'spurious': self.spurious_checkbox.isChecked(),
-                'psd': self.psd_checkbox.isChecked()
-            },
-            board_bringup=self.get_test_stage_requirements(self.bbu_tab),
-            sit=self.get_test_stage_requirements(self.sit_tab),
-            test_campaign=self.get_test_stage_requirements(self.tc_tab)
-        )
+        # Create DUT configuration (frequency ranges must be ordered)
+        try:
+            dut_config = DUTConfiguration(
+                name=self.name_edit.text().strip(),
+                part_number=self.part_number_edit.text().strip(),
+                operational_range=FrequencyRange(
+                    min_freq=self.op_min_edit.value(),
+                    max_freq=self.op_max_edit.value()
+                ),
+                wideband_range=FrequencyRange(
+                    min_freq=self.wb_min_edit.value(),
+                    max_freq=self.wb_max_edit.value()
+                ),
+                num_ports=self.num_ports_spin.value(),
+                input_ports=input_ports,
+                output_ports=output_ports,
+                hg_lg_enabled=self.hg_lg_checkbox.isChecked(),
+                test_enables={
+                    's_parameters': self.s_param_checkbox.isChecked(),
+                    'compression': self.compression_checkbox.isChecked(),
+                    'linearity': self.linearity_checkbox.isChecked(),
+                    'noise_figure': self.nf_checkbox.isChecked(),
+                    'spurious': self.spurious_checkbox.isChecked(),
+                    'psd': self.psd_checkbox.isChecked()
+                },
+                board_bringup=self.get_test_stage_requirements(self.bbu_tab),
+                sit=self.get_test_stage_requirements(self.sit_tab),
+                test_campaign=self.get_test_stage_requirements(self.tc_tab)
+            )
+        except ValueError as e:
+            QMessageBox.warning(self, "Validation Error", str(e))
+            return
         
         # Save to config manager
         if self.current_dut and self.current_dut.name == dut_config.name:
@@ -11,7 +11,7 @@ from src.views.plot_window import PlotWindow
 from src.controllers.file_parser import FileParser
 from src.utils.csv_reader import CSVReader
 from src.controllers.nf_processor import NoiseFigureProcessor
-from src.constants import TEST_STAGES, DEFAULT_TEST_STAGE, TEST_STAGE_DISPLAY_NAMES
+from src.constants import DEFAULT_TEST_STAGE, TEST_STAGE_DISPLAY_NAMES
 from typing import List, Dict, Any, Optional
 
 class NFTab(QWidget):
@@ -263,13 +263,8 @@ class NFTab(QWidget):
             return
         
         # Get requirements for current test stage
-        if test_stage == TEST_STAGES["board_bringup"]:
-            requirements = dut_config.board_bringup
-        elif test_stage == TEST_STAGES["sit"]:
-            requirements = dut_config.sit
-        elif test_stage == TEST_STAGES["test_campaign"]:
-            requirements = dut_config.test_campaign
-        else:
+        requirements = dut_config.get_requirements(test_stage)
+        if requirements is None:
             return
         
         compliance_data = []
@@ -459,9 +459,9 @@ class PlotWindow(QMainWindow):
             for s_param_name, data in plot_data_dict.items():
                 if 'curves' in data:
                     for curve in data['curves']:
-                        # Convert to lists to avoid numpy array issues
-                        x_data = list(curve['x']) if hasattr(curve['x'], '__iter__') else [curve['x']]
-                        y_data = list(curve['y']) if hasattr(curve['y'], '__iter__') else [curve['y']]
+                        # Plot the curve arrays as they are (no copy for ndarray payloads); scalars become 1-element arrays
+                        x_data = np.atleast_1d(curve['x'])
+                        y_data = np.atleast_1d(curve['y'])
                         
                         try:
                             line_obj = ax.plot(x_data, y_data, 
@@ -949,18 +949,18 @@ class PlotWindow(QMainWindow):
             xdata = line.get_xdata()
             ydata = line.get_ydata()
             
-            # Calculate distance from mouse to each point
-            for i, (x, y) in enumerate(zip(xdata, ydata)):
-                # Transform to display coordinates
-                display_x, display_y = self.current_ax.transData.transform((x, y))
-                mouse_x, mouse_y = event.x, event.y
-                
-                distance = np.sqrt((display_x - mouse_x)**2 + (display_y - mouse_y)**2)
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_line = line
-                    closest_index = i
+            # Transform all points to display coordinates at once and take the distance from
+            # the mouse to each as one vectorized magnitude (non-finite distances never win)
+            display_points = self.current_ax.transData.transform(
+                np.column_stack((np.asarray(xdata, dtype=float), np.asarray(ydata, dtype=float))))
+            distances = np.hypot(display_points[:, 0] - event.x, display_points[:, 1] - event.y)
+            distances[~np.isfinite(distances)] = np.inf
+            i = int(np.argmin(distances))
+            
+            if distances[i] < min_distance:
+                min_distance = distances[i]
+                closest_line = line
+                closest_index = i
         
         # Show tooltip if close enough (within 20 pixels)
         if min_distance < 20 and closest_line is not None:
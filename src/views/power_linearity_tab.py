@@ -11,7 +11,7 @@ from src.views.plot_window_simple import PlotWindow
 from src.controllers.file_parser import FileParser
 from src.utils.csv_reader import CSVReader
 from src.controllers.power_processor import PowerProcessor
-from src.constants import TEST_STAGES, DEFAULT_TEST_STAGE, TEST_STAGE_DISPLAY_NAMES
+from src.constants import DEFAULT_TEST_STAGE, TEST_STAGE_DISPLAY_NAMES
 from typing import List, Dict, Any, Optional
 
 class PowerLinearityTab(QWidget):
@@ -187,14 +187,7 @@ class PowerLinearityTab(QWidget):
             # Check if operational range button should be enabled
             # It's enabled if compression is enabled AND there are power/linearity requirements
             test_stage = self.main_window.current_test_stage if self.main_window else "board_bringup"
-            if test_stage == "board_bringup":
-                requirements = dut_config.board_bringup
-            elif test_stage == "sit":
-                requirements = dut_config.sit
-            elif test_stage == "test_campaign":
-                requirements = dut_config.test_campaign
-            else:
-                requirements = dut_config.board_bringup
+            requirements = dut_config.get_requirements(test_stage) or dut_config.board_bringup
             
             has_power_requirements = len(requirements.pin_pout_im3_requirements) > 0
             self.operational_range_btn.setEnabled(compression_enabled and has_power_requirements)
@@ -321,14 +314,8 @@ class PowerLinearityTab(QWidget):
             # Get temperature data for each frequency
             temperature = df['Thermister Calc (C)'].tolist()
             
-            # Group by frequency (assuming 3 frequencies)
-            freq_groups = []
-            for i in range(3):  # 3 frequencies
-                freq_indices = list(range(i, len(temperature), 3))
-                freq_temp = [temperature[j] for j in freq_indices]
-                freq_groups.append(freq_temp)
-            
-            return freq_groups
+            # Group by frequency (assuming 3 frequencies) - strided slices, no index lists
+            return [temperature[i::3] for i in range(3)]
             
         except Exception as e:
             print(f"Error extracting temperature data: {e}")
@@ -398,13 +385,8 @@ class PowerLinearityTab(QWidget):
             return
         
         # Get requirements for current test stage
-        if test_stage == TEST_STAGES["board_bringup"]:
-            requirements = dut_config.board_bringup
-        elif test_stage == TEST_STAGES["sit"]:
-            requirements = dut_config.sit
-        elif test_stage == TEST_STAGES["test_campaign"]:
-            requirements = dut_config.test_campaign
-        else:
+        requirements = dut_config.get_requirements(test_stage)
+        if requirements is None:
             return
         
         compliance_data = []
@@ -438,8 +420,11 @@ class PowerLinearityTab(QWidget):
         for freq, result_data in pri_data.items():
             red_result_data = red_data.get(freq, {}) if red_data else {}
             
-            for i, req_result in enumerate(result_data.get('pin_pout_im3_results', [])):
-                red_req_result = red_result_data.get('pin_pout_im3_results', [])[i] if red_result_data and i < len(red_result_data.get('pin_pout_im3_results', [])) else None
+            pri_req_results = self.power_processor.pin_pout_im3_rows(result_data.get('pin_pout_im3_results'))
+            red_req_results = self.power_processor.pin_pout_im3_rows(red_result_data.get('pin_pout_im3_results'))
+            
+            for i, req_result in enumerate(pri_req_results):
+                red_req_result = red_req_results[i] if i < len(red_req_results) else None
                 
                 # Pout requirement
                 compliance_data.append({
@@ -12,7 +12,7 @@ from src.controllers.file_parser import FileParser
 from src.utils.touchstone_reader import TouchstoneReader
 from src.controllers.sparam_processor import SParameterProcessor
 from src.models.dut_config import DUTConfiguration
-from src.constants import TEST_STAGES, DEFAULT_TEST_STAGE, TEST_STAGE_DISPLAY_NAMES
+from src.constants import DEFAULT_TEST_STAGE, TEST_STAGE_DISPLAY_NAMES
 from typing import List, Dict, Any, Optional
 
 class SParamTab(QWidget):
@@ -186,7 +186,7 @@ class SParamTab(QWidget):
         
         try:
             # Parse filenames
-            is_valid, message, metadata_list = self.file_parser.validate_file_set(
+            is_valid, message, metadata_list, file_by_metadata = self.file_parser.validate_file_set(
                 files, dut_config.hg_lg_enabled)
             
             if not is_valid:
@@ -196,9 +196,10 @@ class SParamTab(QWidget):
             
             self.progress_bar.setValue(25)
             
-            # Read all Touchstone files
+            # Read all Touchstone files, each paired with its parsed metadata through the index
             self.s_param_data_list = []
-            for i, file_path in enumerate(files):
+            for i, metadata in enumerate(metadata_list):
+                file_path = file_by_metadata[metadata]
                 s_param_data = self.touchstone_reader.read_touchstone_file(file_path)
                 if not s_param_data:
                     QMessageBox.warning(self, "File Read Error", 
@@ -212,13 +213,12 @@ class SParamTab(QWidget):
             test_stage = self.main_window.current_test_stage if self.main_window else DEFAULT_TEST_STAGE
             self.processed_results = {}
             
-            for i, s_param_data in enumerate(self.s_param_data_list):
-                metadata = metadata_list[i] if i < len(metadata_list) else None
+            for metadata, s_param_data in zip(metadata_list, self.s_param_data_list):
                 results = self.sparam_processor.process_s_parameters(
                     s_param_data, dut_config, test_stage)
                 
                 # Store results with metadata
-                file_key = f"{metadata.pri_red}_{metadata.hg_lg}" if metadata and metadata.hg_lg else metadata.pri_red if metadata else f"file_{i}"
+                file_key = f"{metadata.pri_red}_{metadata.hg_lg}" if metadata.hg_lg else metadata.pri_red
                 self.processed_results[file_key] = results
             
             self.progress_bar.setValue(75)
@@ -286,13 +286,8 @@ class SParamTab(QWidget):
             return
         
         # Get requirements for current test stage
-        if test_stage == TEST_STAGES["board_bringup"]:
-            requirements = dut_config.board_bringup
-        elif test_stage == TEST_STAGES["sit"]:
-            requirements = dut_config.sit
-        elif test_stage == TEST_STAGES["test_campaign"]:
-            requirements = dut_config.test_campaign
-        else:
+        requirements = dut_config.get_requirements(test_stage)
+        if requirements is None:
             return
         
         compliance_data = []
@@ -0,0 +1,81 @@
+"""
+Shared fixtures for the processor tests
+"""
+
+import numpy as np
+import pytest
+from src.models.dut_config import (DUTConfiguration, FrequencyRange, OutOfBandRequirement,
+                                   PinPoutIM3Requirement, TestStageRequirements)
+from src.models.test_data import PowerLinearityData, SParameterData
+
+
+def _stage_requirements() -> TestStageRequirements:
+    """Requirements used for every test stage of the test DUT."""
+    return TestStageRequirements(
+        gain_min_db=10.0,
+        gain_max_db=30.0,
+        gain_flatness_db=3.0,
+        vswr_max=2.0,
+        out_of_band_requirements=[OutOfBandRequirement(0.5, 0.9, 20.0), OutOfBandRequirement(3.2, 4.0, 25.0)],
+        p1db_min_dbm=10.0,
+        pin_pout_im3_requirements=[PinPoutIM3Requirement(-10.0, 5.0, -30.0),
+                                   PinPoutIM3Requirement(-2.5, 12.0, -25.0)],
+        nf_max_db=3.0
+    )
+
+
+@pytest.fixture
+def dut_config() -> DUTConfiguration:
+    """Two-port DUT operating from 1 to 3 GHz."""
+    return DUTConfiguration(
+        name="Test DUT",
+        part_number="L123456",
+        operational_range=FrequencyRange(1.0, 3.0),
+        wideband_range=FrequencyRange(0.5, 4.0),
+        num_ports=2,
+        input_ports=[1],
+        output_ports=[2],
+        board_bringup=_stage_requirements(),
+        sit=_stage_requirements(),
+        test_campaign=_stage_requirements()
+    )
+
+
+@pytest.fixture
+def power_data() -> PowerLinearityData:
+    """Compressing single-tone and two-tone sweeps at two frequencies."""
+    pin = np.arange(-20.0, 11.0, 1.0)
+    freq_data = {}
+    for freq, gain in ((2.0, 15.0), (2.5, 14.0)):
+        pout = pin + gain - 0.05 * np.maximum(pin + 5.0, 0.0) ** 2
+        im3 = -60.0 + 2.0 * (pin + 20.0)
+        freq_data[freq] = {
+            'single_tone_pin': pin,
+            'single_tone_pout': pout,
+            'two_tone_pin': pin,
+            'two_tone_im3': im3,
+            'two_tone_im5': im3 - 10.0
+        }
+    return PowerLinearityData(
+        frequency=np.repeat(list(freq_data), 2 * len(pin)),
+        pin=np.tile(pin, 2 * len(freq_data)),
+        pout_single_tone=np.zeros(2 * len(freq_data) * len(pin)),
+        im3=np.zeros(2 * len(freq_data) * len(pin)),
+        im5=np.zeros(2 * len(freq_data) * len(pin)),
+        test_type=np.zeros(2 * len(freq_data) * len(pin), dtype=np.int8),
+        freq_data=freq_data
+    )
+
+
+@pytest.fixture
+def s_param_data() -> SParameterData:
+    """Band-pass S21 with matched ports, swept from 0.5 to 4 GHz."""
+    frequency = np.linspace(0.5, 4.0, 36)
+    gain_db = np.where((frequency >= 1.0) & (frequency <= 3.0), 20.0, -10.0) + 0.1 * np.sin(frequency)
+    s21 = 10 ** (gain_db / 20) * np.exp(-1j * frequency)
+    reflection = (0.1 + 0.05 * np.cos(frequency)) * np.exp(1j * frequency)
+    return SParameterData(
+        frequency=frequency,
+        s_parameters={'S11': reflection, 'S21': s21, 'S12': s21 / 100, 'S22': reflection * 1.5},
+        format="real/imag"
+    )
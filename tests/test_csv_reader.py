@@ -0,0 +1,23 @@
+"""
+Tests for the CSV/Excel data readers
+"""
+
+import numpy as np
+from src.utils.csv_reader import CSVReader
+
+
+def test_noise_figure_skips_non_numeric_rows(tmp_path, capsys):
+    path = tmp_path / "nf.csv"
+    path.write_text("Frequency,Noise Figure\n"
+                    "1500,1.5\n"
+                    "abc,2.0\n"
+                    "2500,--\n"
+                    "3.5,\n"
+                    "4.0,3.0\n")
+    
+    nf_data = CSVReader().read_noise_figure_csv(str(path))
+    
+    assert nf_data is not None
+    np.testing.assert_array_equal(nf_data.frequency, [1.5, 4.0])
+    np.testing.assert_array_equal(nf_data.nf, [1.5, 3.0])
+    assert "Warning: Skipping 2 row(s) with non-numeric data" in capsys.readouterr().out
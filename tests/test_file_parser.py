@@ -0,0 +1,70 @@
+"""
+Tests for filename parsing and file set validation
+"""
+
+import random
+import re
+import pytest
+from src.controllers.file_parser import FileParser
+from src.models.test_data import FileMetadata
+
+# Reference parser - the original independent per-field searches
+_REFERENCE_PATTERNS = (
+    ('date_code', re.compile(r'(\d{8})')),
+    ('serial_number', re.compile(r'(SN\d+)', re.IGNORECASE)),
+    ('part_number', re.compile(r'(L\d{4,6})', re.IGNORECASE)),
+    ('pri_red', re.compile(r'_(PRI|RED)(?:_|\.)', re.IGNORECASE)),
+    ('hg_lg', re.compile(r'_(HG|LG)(?:_|\.)', re.IGNORECASE))
+)
+
+
+def reference_parse(basename):
+    """Parse a basename the way the original FileParser.parse_filename did."""
+    fields = {}
+    for name, pattern in _REFERENCE_PATTERNS:
+        match = pattern.search(basename)
+        if not match:
+            if name == 'hg_lg':
+                fields[name] = None
+                continue
+            return None
+        fields[name] = match.group(1) if name == 'date_code' else match.group(1).upper()
+    return FileMetadata(**fields)
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("20240115_L123456_PRI_SN0042.csv", FileMetadata("20240115", "SN0042", "L123456", "PRI", None)),
+    ("/data/20240115_l1234_red_sn7_lg.s2p", FileMetadata("20240115", "SN7", "L1234", "RED", "LG")),
+    ("SN0042_RED_HG_L123456_20240115.csv", FileMetadata("20240115", "SN0042", "L123456", "RED", "HG")),
+    ("20240115_L1234567_PRI_SN1.csv", FileMetadata("20240115", "SN1", "L123456", "PRI", None)),
+    ("20240115_L123456_PRI_SN1.x_HG_.csv", FileMetadata("20240115", "SN1", "L123456", "PRI", "HG")),
+    ("20240115_L123456_PRIMARY_SN1.csv", None),
+    ("notes.txt", None)
+])
+def test_parse_filename(filename, expected):
+    assert FileParser().parse_filename(filename) == expected
+
+
+def test_parse_filename_matches_reference():
+    tokens = ["20240115", "2024011", "123456789", "L1234", "l12345", "L1234567", "L12", "SN0042", "sn7", "SN",
+              "_PRI", "_RED", "_pri", "_PRIX", "_HG", "_lg", "_HGX", "_", "_", ".", ".csv", ".s2p", "x", "9"]
+    rng = random.Random(0)
+    parser = FileParser()
+    for _ in range(5000):
+        basename = "".join(rng.choice(tokens) for _ in range(rng.randint(1, 9)))
+        assert parser.parse_filename(basename) == reference_parse(basename), basename
+
+
+
+def test_validate_file_set_returns_metadata_index():
+    files = ["/data/20240115_L123456_PRI_SN0042.csv", "/data/20240115_L123456_RED_SN0042.csv"]
+    valid, message, metadata_list, file_by_metadata = FileParser().validate_file_set(files, hg_lg_enabled=False)
+    assert valid, message
+    assert [metadata.pri_red for metadata in metadata_list] == ["PRI", "RED"]
+    assert file_by_metadata == dict(zip(metadata_list, files))
+    
+    valid, message, metadata_list, file_by_metadata = FileParser().validate_file_set(files[:1], hg_lg_enabled=False)
+    assert not valid
+    assert len(metadata_list) == 1 and len(file_by_metadata) == 1
+    
+    assert FileParser().validate_file_set(["notes.txt"], hg_lg_enabled=False)[2:] == ([], {})
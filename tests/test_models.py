@@ -0,0 +1,80 @@
+"""
+Tests for the data models
+"""
+
+import copy
+import dataclasses
+import pickle
+import numpy as np
+import pytest
+from src.controllers.nf_processor import NoiseFigureProcessor
+from src.models.dut_config import FrequencyRange, OutOfBandRequirement
+from src.models.test_data import (FileMetadata, NoiseFigureData, PowerLinearityData, TEST_TYPE_SINGLE_TONE,
+                                  TEST_TYPE_TWO_TONE)
+
+
+def test_file_metadata_is_slotted_and_frozen():
+    metadata = FileMetadata("20240115", "SN0042", "L123456", "PRI")
+    assert not hasattr(metadata, '__dict__')
+    assert metadata.hg_lg is None
+    assert {metadata: 1}[FileMetadata("20240115", "SN0042", "L123456", "PRI", None)] == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        metadata.hg_lg = "HG"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        metadata.notes = "extra"
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_file_metadata_pickles(protocol):
+    metadata = FileMetadata("20240115", "SN0042", "L123456", "RED", "LG")
+    assert pickle.loads(pickle.dumps(metadata, protocol)) == metadata
+
+
+def test_file_metadata_copies():
+    metadata = FileMetadata("20240115", "SN0042", "L123456", "RED", "LG")
+    assert copy.copy(metadata) == metadata
+    assert copy.deepcopy(metadata) == metadata
+    assert dataclasses.replace(metadata, hg_lg="HG").hg_lg == "HG"
+
+
+def test_noise_figure_data_rows_are_read_only_views():
+    nf_data = NoiseFigureData(frequency=[1.0, 2.0, 3.0], nf=[1.5, 4.0, 2.5])
+    assert nf_data.data.shape == (2, 3) and nf_data.data.flags['C_CONTIGUOUS']
+    assert np.shares_memory(nf_data.frequency, nf_data.data) and np.shares_memory(nf_data.nf, nf_data.data)
+    with pytest.raises(AttributeError):
+        nf_data.nf = [0.0, 0.0, 0.0]
+    
+    assert NoiseFigureProcessor().find_worst_case_nf(nf_data.data) == (4.0, 2.0, 1)
+    assert NoiseFigureProcessor().find_worst_case_nf(NoiseFigureData([], []).data) == (0.0, 0.0, 0)
+
+
+def test_reversed_frequency_bounds_raise():
+    with pytest.raises(ValueError):
+        FrequencyRange(3.0, 1.0)
+    with pytest.raises(ValueError):
+        OutOfBandRequirement(4.0, 3.2, 25.0)
+    assert FrequencyRange(2.0, 2.0).max_freq == 2.0
+
+
+def _power_data(test_type, freq_data=None) -> PowerLinearityData:
+    """Two-row power data with the given test types."""
+    return PowerLinearityData(frequency=[2.0, 2.0], pin=[0.0, 1.0], pout_single_tone=[10.0, 11.0],
+                              im3=[0.0, 0.0], im5=[0.0, 0.0], test_type=test_type, freq_data=freq_data or {})
+
+
+def test_power_data_maps_test_type_labels():
+    power_data = _power_data(["single-tone", "two-tone"])
+    assert power_data.test_type.dtype == np.int8
+    assert power_data.test_type.tolist() == [TEST_TYPE_SINGLE_TONE, TEST_TYPE_TWO_TONE]
+    with pytest.raises(ValueError):
+        _power_data(["single-tone", "three-tone"])
+
+
+def test_power_data_leaves_caller_freq_data_unchanged():
+    pin = [0.0, 1.0]
+    freq_data = {2.0: {'single_tone_pin': pin, 'two_tone_pin': pin}}
+    power_data = _power_data([0, 1], freq_data)
+    assert freq_data[2.0]['single_tone_pin'] is pin
+    columns = power_data.freq_data[2.0]
+    assert columns is not freq_data[2.0] and columns['single_tone_pin'].dtype == np.float64
+    assert columns['single_tone_pin'] is columns['two_tone_pin']
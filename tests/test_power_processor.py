@@ -0,0 +1,35 @@
+"""
+Tests for the power and linearity processor
+"""
+
+import dataclasses
+from src.controllers.power_processor import PowerProcessor
+
+
+def test_results_cache_returns_independent_copies(power_data, dut_config):
+    processor = PowerProcessor()
+    first = processor.process_power_linearity(power_data, dut_config, "sit")
+    first[2.0]['extra'] = True
+    first[2.0]['pin_pout_im3_results']['pout_measured'] = None
+    
+    second = processor.process_power_linearity(power_data, dut_config, "sit")
+    assert len(processor._results_cache) == 1
+    assert 'extra' not in second[2.0]
+    assert second[2.0]['pin_pout_im3_results']['pout_measured'] is not None
+    assert '_sorted' not in second[2.0]
+    
+    # Plotting must not write into the cached results either
+    processor.get_plot_data({'PRI': second}, "compression", dut_config, None, "sit")
+    third = processor.process_power_linearity(power_data, dut_config, "sit")
+    assert set(third[2.0]) == set(second[2.0])
+
+
+def test_new_requirements_object_is_a_cache_miss(power_data, dut_config):
+    processor = PowerProcessor()
+    before = processor.process_power_linearity(power_data, dut_config, "sit")
+    assert all(result['p1db_pass'] for result in before.values())
+    
+    dut_config.sit = dataclasses.replace(dut_config.sit, p1db_min_dbm=100.0)
+    after = processor.process_power_linearity(power_data, dut_config, "sit")
+    assert len(processor._results_cache) == 2
+    assert not any(result['p1db_pass'] for result in after.values())
@@ -0,0 +1,193 @@
+"""
+Regression tests comparing the vectorized processors against the original reference algorithms
+"""
+
+import numpy as np
+import pytest
+from src.constants import P1DB_THRESHOLD_DB
+from src.controllers.power_processor import PowerProcessor
+from src.controllers.sparam_processor import SParameterProcessor
+from src.models.dut_config import OutOfBandRequirement
+
+
+def reference_find_p1db(pin, pout):
+    """Original P1dB scan."""
+    if len(pin) < 2 or len(pout) < 2:
+        return 0.0
+    small_signal_gain = (pout[1] - pout[0]) / (pin[1] - pin[0])
+    for i in range(1, len(pin)):
+        current_gain = (pout[i] - pout[i-1]) / (pin[i] - pin[i-1])
+        gain_drop = small_signal_gain - current_gain
+        if gain_drop >= P1DB_THRESHOLD_DB:
+            if i < len(pin) - 1:
+                return pout[i-1] + (pout[i] - pout[i-1]) * (1.0 / gain_drop)
+            return pout[i]
+    return max(pout)
+
+
+def reference_interpolate_at_pin(pin, values, target_pin):
+    """Original segment search with linear extrapolation past either end."""
+    if len(pin) != len(values) or len(pin) < 2:
+        return 0.0
+    for i in range(len(pin) - 1):
+        if pin[i] <= target_pin <= pin[i + 1]:
+            ratio = (target_pin - pin[i]) / (pin[i + 1] - pin[i])
+            return values[i] + ratio * (values[i + 1] - values[i])
+    if target_pin < pin[0]:
+        ratio = (target_pin - pin[0]) / (pin[1] - pin[0])
+        return values[0] + ratio * (values[1] - values[0])
+    ratio = (target_pin - pin[-2]) / (pin[-1] - pin[-2])
+    return values[-2] + ratio * (values[-1] - values[-2])
+
+
+def reference_range_indices(frequencies, freq_min, freq_max):
+    """Original nearest-point band lookup."""
+    freq_array = np.array(frequencies)
+    min_idx = int(np.argmin(np.abs(freq_array - freq_min)))
+    max_idx = int(np.argmin(np.abs(freq_array - freq_max)))
+    return min(min_idx, max_idx), max(min_idx, max_idx)
+
+
+def reference_vswr(s11):
+    """Original per-point VSWR, capped at 1000 for |S11| >= 1."""
+    return [1000.0 if abs(s) >= 1.0 else (1 + abs(s)) / (1 - abs(s)) for s in s11]
+
+
+def reference_vswr_max(frequencies, vswr, freq_min, freq_max):
+    """Original in-band VSWR maximum, ignoring infinite values."""
+    min_idx, max_idx = reference_range_indices(frequencies, freq_min, freq_max)
+    vswr_finite = [v for v in vswr[min_idx:max_idx+1] if v != float('inf')]
+    return max(vswr_finite) if vswr_finite else 0.0
+
+
+def reference_oob_rejection(frequencies, gain, oob_requirement, operational_min, operational_max):
+    """Original OoB rejection: worst in-band gain minus worst OoB gain."""
+    op_min_idx, op_max_idx = reference_range_indices(frequencies, operational_min, operational_max)
+    worst_case_operational = min(gain[op_min_idx:op_max_idx+1])
+    oob_min_idx, oob_max_idx = reference_range_indices(frequencies, oob_requirement.freq_min,
+                                                       oob_requirement.freq_max)
+    worst_case_oob = max(gain[oob_min_idx:oob_max_idx+1])
+    rejection = worst_case_operational - worst_case_oob
+    return {
+        'rejection_db': rejection,
+        'worst_case_operational': worst_case_operational,
+        'worst_case_oob': worst_case_oob,
+        'requirement': oob_requirement.rejection_db,
+        'pass': rejection > oob_requirement.rejection_db
+    }
+
+
+def random_sweep(rng, n):
+    """Ascending Pin sweep with a compressing (or not) Pout response."""
+    pin = np.unique(rng.uniform(-30.0, 15.0, n))  # Sorted, no repeated Pins
+    compression = rng.uniform(0.0, 0.2)
+    pout = pin + rng.uniform(5.0, 30.0) - compression * np.maximum(pin - rng.uniform(-20.0, 10.0), 0.0) ** 2
+    return pin, pout + rng.normal(0.0, 0.05, len(pin))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_p1db_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    processor = PowerProcessor()
+    for n in (2, 3, 5, 16, 17, 40, 200):
+        pin, pout = random_sweep(rng, n)
+        assert processor.find_p1db(pin, pout) == pytest.approx(reference_find_p1db(pin.tolist(), pout.tolist()),
+                                                               rel=1e-12, abs=1e-12)
+
+
+def test_find_p1db_exact_threshold_drop_matches_reference():
+    # The second step's gain drop rounds to just under 1dB, while gains[0] - 1dB rounds to exactly
+    # its gain - only comparing the drop itself skips that step like the original scan
+    pin = [0.0, 1.0, 2.0, 3.0]
+    pout = [3.0, 1.7, -0.6, -5.0]
+    assert PowerProcessor().find_p1db(pin, pout) == reference_find_p1db(pin, pout) == -5.0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_interpolation_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    processor = PowerProcessor()
+    pin, pout = random_sweep(rng, int(rng.integers(2, 60)))
+    # Inside, outside and exactly on the sweep points
+    targets = np.concatenate([rng.uniform(pin[0] - 5.0, pin[-1] + 5.0, 25), pin])
+    expected = [reference_interpolate_at_pin(pin.tolist(), pout.tolist(), t) for t in targets.tolist()]
+    
+    np.testing.assert_allclose(processor.interpolate_at_pins(pin, pout, targets), expected, rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose([processor.interpolate_at_pin(pin, pout, t) for t in targets], expected,
+                               rtol=1e-12, atol=1e-9)
+    
+    # Batched over several frequencies sharing the Pin grid
+    rows = {freq: {'pin': pin, 'value': pout + freq} for freq in (1.0, 2.0, 3.0)}
+    batched = processor._interpolate_shared_grid(rows, 'pin', 'value', targets)
+    for freq, interpolated in batched.items():
+        np.testing.assert_allclose(interpolated, np.array(expected) + freq, rtol=1e-12, atol=1e-9)
+    
+    # P1dB and Pout interpolation from the shared sweep steps give the separate calls' results exactly
+    p1db, pout_at_targets = processor._analyze_single_tone(pin, pout, targets)
+    assert p1db == processor.find_p1db(pin, pout)
+    np.testing.assert_array_equal(pout_at_targets, processor.interpolate_at_pins(pin, pout, targets))
+
+
+def test_interpolation_with_repeated_pins_matches_reference():
+    processor = PowerProcessor()
+    for pin, values in (([0.0, 1.0, 2.0, 2.0], [1.0, 2.0, 3.0, 3.5]),
+                        ([0.0, 1.0, 1.0, 2.0], [1.0, 2.0, 2.5, 3.0])):
+        for target in (0.5, 1.0, 1.5, 2.0):
+            expected = reference_interpolate_at_pin(pin, values, target)
+            assert processor.interpolate_at_pin(pin, values, target) == expected
+            assert processor.interpolate_at_pins(pin, values, [target])[0] == expected
+            assert processor._analyze_single_tone(np.array(pin), np.array(values),
+                                                  np.array([target]))[1][0] == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_frequency_range_indices_match_reference(seed):
+    rng = np.random.default_rng(seed)
+    processor = SParameterProcessor()
+    frequencies = np.sort(np.round(rng.uniform(0.5, 4.0, int(rng.integers(1, 80))), 2))  # Repeats included
+    for _ in range(20):
+        freq_min, freq_max = np.sort(rng.uniform(0.0, 4.5, 2))
+        assert processor.find_frequency_range_indices(frequencies, freq_min, freq_max) == \
+            reference_range_indices(frequencies, freq_min, freq_max)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vswr_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    processor = SParameterProcessor()
+    n = 64
+    frequencies = np.linspace(0.5, 4.0, n)
+    magnitude = rng.uniform(0.0, 1.2, n)
+    magnitude[rng.integers(0, n, 3)] = 1.0
+    s11 = magnitude * np.exp(1j * rng.uniform(-np.pi, np.pi, n))
+    expected = reference_vswr(s11)
+    
+    vswr = processor.calculate_vswr(s11)
+    np.testing.assert_allclose(vswr, expected, rtol=1e-9)
+    
+    vswr_with_inf = vswr.copy()
+    vswr_with_inf[rng.integers(0, n, 3)] = np.inf
+    for freq_min, freq_max in ((1.0, 3.0), (0.0, 5.0), (2.2, 2.2)):
+        assert processor.calculate_vswr_max(frequencies, vswr_with_inf, freq_min, freq_max) == pytest.approx(
+            reference_vswr_max(frequencies, vswr_with_inf.tolist(), freq_min, freq_max), rel=1e-9)
+        band = processor.find_frequency_range_indices(frequencies, freq_min, freq_max)
+        assert processor._vswr_max_in_band(vswr, band, capped=True) == pytest.approx(
+            reference_vswr_max(frequencies, expected, freq_min, freq_max), rel=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_out_of_band_rejection_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    processor = SParameterProcessor()
+    frequencies = np.linspace(0.5, 4.0, int(rng.integers(2, 120)))
+    s21 = rng.uniform(0.01, 10.0, len(frequencies)) * np.exp(1j * rng.uniform(-np.pi, np.pi, len(frequencies)))
+    gain = processor.calculate_gain(s21)
+    np.testing.assert_allclose(gain, [20 * np.log10(abs(s)) for s in s21.tolist()], rtol=1e-12, atol=1e-12)
+    requirements = [OutOfBandRequirement(*np.sort(rng.uniform(0.0, 4.5, 2)), rng.uniform(0.0, 30.0))
+                    for _ in range(int(rng.integers(1, 6)))]
+    
+    results = processor.calculate_out_of_band_rejections(frequencies, gain, requirements, 1.0, 3.0)
+    for requirement, result in zip(requirements, results):
+        expected = reference_oob_rejection(frequencies, gain.tolist(), requirement, 1.0, 3.0)
+        assert result == pytest.approx(expected, rel=1e-12)
+        assert result['pass'] == expected['pass']
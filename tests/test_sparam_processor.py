@@ -0,0 +1,66 @@
+"""
+Tests for the S-parameter processor
+"""
+
+import dataclasses
+import pytest
+from src.controllers.sparam_processor import SParameterProcessor, _RANGE_CACHE_SIZE
+
+
+def test_results_cache_returns_independent_copies(s_param_data, dut_config):
+    processor = SParameterProcessor()
+    first = processor.process_s_parameters(s_param_data, dut_config, "sit")
+    first['S21']['extra'] = True
+    first['S21']['out_of_band_rejections'][0]['pass'] = None
+    
+    second = processor.process_s_parameters(s_param_data, dut_config, "sit")
+    assert len(processor._results_cache) == 1
+    assert 'extra' not in second['S21']
+    assert second['S21']['out_of_band_rejections'][0]['pass'] is not None
+    
+    # Plotting must not write into the cached results either
+    for plot_type in ("wideband_gain", "operational_gain", "wideband_vswr", "operational_vswr"):
+        processor.get_plot_data({'PRI': second}, plot_type, dut_config, "sit")
+    third = processor.process_s_parameters(s_param_data, dut_config, "sit")
+    assert all(set(third[name]) == set(second[name]) for name in third)
+
+
+def test_new_configuration_or_stage_is_a_cache_miss(s_param_data, dut_config):
+    processor = SParameterProcessor()
+    before = processor.process_s_parameters(s_param_data, dut_config, "sit")
+    assert before['S21']['pass_fail'] == "Pass"
+    
+    processor.process_s_parameters(s_param_data, dut_config, "board_bringup")
+    assert len(processor._results_cache) == 2
+    
+    strict = dataclasses.replace(dut_config, sit=dataclasses.replace(dut_config.sit, gain_min_db=25.0))
+    after = processor.process_s_parameters(s_param_data, strict, "sit")
+    assert len(processor._results_cache) == 3
+    assert after['S21']['pass_fail'] == "Fail"
+
+
+def test_reversed_frequency_range_raises(s_param_data):
+    processor = SParameterProcessor()
+    with pytest.raises(ValueError):
+        processor.find_frequency_range_indices(s_param_data.frequency, 3.0, 1.0)
+
+
+def test_range_cache_evicts_least_recently_used(s_param_data):
+    processor = SParameterProcessor()
+    frequencies = s_param_data.frequency
+    processor.find_frequency_range_indices(frequencies, 1.0, 3.0)
+    for i in range(_RANGE_CACHE_SIZE - 1):
+        processor.find_frequency_range_indices(frequencies, 0.5, 1.0 + i * 0.01)
+    
+    # Touching the first range keeps it; the next new range evicts the oldest other entry
+    processor.find_frequency_range_indices(frequencies, 1.0, 3.0)
+    processor.find_frequency_range_indices(frequencies, 0.5, 4.0)
+    keys = [key[1:] for key in processor._range_cache]
+    assert len(keys) == _RANGE_CACHE_SIZE
+    assert (1.0, 3.0) in keys
+    assert (0.5, 1.0) not in keys
+    assert processor.find_frequency_range_indices(frequencies, 1.0, 3.0) == (5, 25)
+    
+    # Converted (non-float64) sweeps are not cached
+    processor.find_frequency_range_indices(frequencies.tolist(), 1.5, 2.5)
+    assert len(processor._range_cache) == _RANGE_CACHE_SIZE